@@ -1,7 +1,11 @@
-from typing import List, Tuple, Set
+import os
+from array import array
+from typing import List, Optional, Tuple, Set
 from copy import deepcopy
 from time import time
 from functools import lru_cache, cached_property
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
 
 class Pohybstrazce:
     def __init__(self, map_data: List[str]):
@@ -14,6 +18,8 @@ class Pohybstrazce:
         self._initial_position = self._find_guard_position()
         self._initial_direction = self._find_guard_direction()
         self.map = None  # Pro ukládání aktuální mapy při simulaci
+        self._navstivene_stavy = None  # Generační značky stavů pro detekci smyček
+        self._generace = 0
         self._guard_pos = self._initial_position
         self._direction = self._initial_direction
     
@@ -64,12 +70,17 @@ class Pohybstrazce:
         return (y + dy, x + dx)
 
     def Najdi_dosazitelne_pozice(self) -> Set[Tuple[int, int]]:
-        """Najde všechny pozice, kam se strážce může dostat bez překážek."""
+        """Najde všechny pozice, kam se strážce může dostat bez překážek.
+
+        Zároveň si pro každou pozici zapamatuje stav (pozice, směr) těsně před
+        jejím prvním navštívením, viz _prvni_vstupy.
+        """
         if hasattr(self, '_dosazitelne_pozice'):
             return self._dosazitelne_pozice
             
         dosazitelne = set()
         navstivene_stavy = set()
+        prvni_vstupy = {}
         
         self.guard_pos = self._initial_position
         self.direction = self._initial_direction
@@ -91,8 +102,11 @@ class Pohybstrazce:
             if self._map_data[next_y][next_x] == '#':
                 self.direction = (self.direction + 1) % 4
             else:
+                if next_pos not in dosazitelne:
+                    prvni_vstupy[next_pos] = (self.guard_pos, self.direction)
                 self.guard_pos = next_pos
         
+        self._prvni_vstupy = prvni_vstupy
         self._dosazitelne_pozice = dosazitelne
         return dosazitelne
 
@@ -114,66 +128,222 @@ class Pohybstrazce:
         
         return True
 
-    def Detekce_smycky(self, max_kroku: int = 10000) -> bool:
-        navstivene_stavy = set()
-        kroky = 0
+    def _nova_generace(self) -> Tuple[array, int]:
+        """Vrátí pole navštívených stavů a číslo nové generace.
+
+        Stav (y * width + x) * 4 + smer je navštívený, pokud je v poli uloženo
+        aktuální číslo generace, takže pole se mezi simulacemi nemusí mazat.
+        """
+        if self._navstivene_stavy is None or self._generace >= 0xFFFFFFFF:
+            self._navstivene_stavy = array('I', bytes(4 * self.height * self.width * 4))
+            self._generace = 0
+        self._generace += 1
+        return self._navstivene_stavy, self._generace
+
+    def Detekce_smycky(self) -> bool:
+        navstivene_stavy, generace = self._nova_generace()
+        sirka = self.width
         
-        while kroky < max_kroku:
-            aktualni_stav = (self.guard_pos, self.direction)
+        while True:
+            y, x = self.guard_pos
+            stav = (y * sirka + x) * 4 + self.direction
             
-            if aktualni_stav in navstivene_stavy:
+            if navstivene_stavy[stav] == generace:
                 return True
                 
-            navstivene_stavy.add(aktualni_stav)
+            navstivene_stavy[stav] = generace
             
             if not self.Simulace_kroku():
                 return False
-                
-            kroky += 1
-        
-        return False
 
-    def Najdi_pozice_smycek(self) -> Set[Tuple[int, int]]:
+    @cached_property
+    def _tabulka_skoku(self) -> List[int]:
+        """Předpočítá pro každou buňku a směr, kde se strážce zastaví před překážkou.
+
+        Stav je zakódován jako (y * width + x) * 4 + smer, hodnota je index buňky,
+        na které strážce zastaví a otočí se, nebo -1, pokud odejde z mapy.
+        """
+        vyska, sirka = self.height, self.width
+        skoky = [-1] * (vyska * sirka * 4)
+        for x in range(sirka):
+            zarazka = -1
+            for y in range(vyska):
+                if self._map_data[y][x] == '#':
+                    zarazka = (y + 1) * sirka + x
+                else:
+                    skoky[(y * sirka + x) * 4] = zarazka
+            zarazka = -1
+            for y in range(vyska - 1, -1, -1):
+                if self._map_data[y][x] == '#':
+                    zarazka = (y - 1) * sirka + x
+                else:
+                    skoky[(y * sirka + x) * 4 + 2] = zarazka
+        for y in range(vyska):
+            radek = self._map_data[y]
+            zarazka = -1
+            for x in range(sirka - 1, -1, -1):
+                if radek[x] == '#':
+                    zarazka = y * sirka + x - 1
+                else:
+                    skoky[(y * sirka + x) * 4 + 1] = zarazka
+            zarazka = -1
+            for x in range(sirka):
+                if radek[x] == '#':
+                    zarazka = y * sirka + x + 1
+                else:
+                    skoky[(y * sirka + x) * 4 + 3] = zarazka
+        return skoky
+
+    def Detekce_smycky_skoky(self, prekazka: Tuple[int, int],
+                             start: Optional[Tuple[Tuple[int, int], int]] = None) -> bool:
+        """Detekce smyčky po skocích mezi překážkami s jednou přidanou překážkou.
+
+        Každý pohyb je jeden skok z tabulky skoků, přidaná překážka se do skoku
+        promítne jen tehdy, když leží mezi strážcem a zarážkou z tabulky.
+        Volitelný start (pozice, směr) nahrazuje počáteční stav strážce.
+        """
+        sirka = self.width
+        skoky = self._tabulka_skoku
+        oy, ox = prekazka
+        if start is None:
+            start = (self._initial_position, self._initial_direction)
+        (y, x), smer = start
+        navstivene_stavy, generace = self._nova_generace()
+
+        while True:
+            cil = skoky[(y * sirka + x) * 4 + smer]
+            if smer == 0:
+                if ox == x and oy < y and (cil == -1 or oy >= cil // sirka):
+                    cil = (oy + 1) * sirka + x
+            elif smer == 1:
+                if oy == y and ox > x and (cil == -1 or ox <= cil % sirka):
+                    cil = y * sirka + ox - 1
+            elif smer == 2:
+                if ox == x and oy > y and (cil == -1 or oy <= cil // sirka):
+                    cil = (oy - 1) * sirka + x
+            elif oy == y and ox < x and (cil == -1 or ox >= cil % sirka):
+                cil = y * sirka + ox + 1
+
+            if cil == -1:
+                return False
+
+            stav = cil * 4 + smer
+            if navstivene_stavy[stav] == generace:
+                return True
+            navstivene_stavy[stav] = generace
+
+            y, x = divmod(cil, sirka)
+            smer = (smer + 1) % 4
+
+    def _je_kandidat(self, pozice: Tuple[int, int]) -> bool:
+        y, x = pozice
+        return pozice != self.pocatecni_pozice and self._map_data[y][x] == '.'
+
+    def _vypis_prubeh(self, zpracovano: int, celkem_pozic: int,
+                      nalezeno: int, cas_zacatek: float) -> None:
+        uplynuly_cas = time() - cas_zacatek
+        prumer_cas = uplynuly_cas / zpracovano
+        zbyvajici_pozice = celkem_pozic - zpracovano
+        odhadovany_cas = zbyvajici_pozice * prumer_cas
+
+        print(f"Zpracováno: {zpracovano}/{celkem_pozic} " +
+              f"({(zpracovano/celkem_pozic*100):.1f}%) " +
+              f"Nalezeno smyček: {nalezeno} " +
+              f"Zbývající čas: {odhadovany_cas:.1f}s")
+
+    def Najdi_pozice_smycek(self, pocet_procesu: int = 1) -> Set[Tuple[int, int]]:
+        """Najde pozice, kde přidaná překážka způsobí smyčku.
+
+        Při pocet_procesu > 1 se kandidáti rozdělí mezi procesy a mapa se
+        pracovníkům předá jednou přes sdílenou paměť.
+        """
         dosazitelne_pozice = self.Najdi_dosazitelne_pozice()
-        pozice_smycek = set()
         
         celkem_pozic = len(dosazitelne_pozice)
-        zpracovano = 0
         cas_zacatek = time()
         
         print(f"Začínám hledat smyčky... Celkem dosažitelných pozic ke kontrole: {celkem_pozic}")
         
-        for y, x in dosazitelne_pozice:
-            zpracovano += 1
-            
-            if zpracovano % 10 == 0 or zpracovano == celkem_pozic:
-                cas_nyni = time()
-                uplynuly_cas = cas_nyni - cas_zacatek
-                prumer_cas = uplynuly_cas / zpracovano
-                zbyvajici_pozice = celkem_pozic - zpracovano
-                odhadovany_cas = zbyvajici_pozice * prumer_cas
-                
-                print(f"Zpracováno: {zpracovano}/{celkem_pozic} " + 
-                      f"({(zpracovano/celkem_pozic*100):.1f}%) " +
-                      f"Nalezeno smyček: {len(pozice_smycek)} " +
-                      f"Zbývající čas: {odhadovany_cas:.1f}s")
-            
-            if (y, x) == self.pocatecni_pozice or self._map_data[y][x] != '.':
-                continue
-            
-            self.map = [list(row) for row in self._map_data]
-            self.map[y][x] = 'O'
-            self.guard_pos = self._initial_position
-            self.direction = self._initial_direction
-            
-            if self.Detekce_smycky():
-                pozice_smycek.add((y, x))
+        if pocet_procesu > 1:
+            pozice_smycek = self._Najdi_pozice_smycek_paralelne(
+                list(dosazitelne_pozice), pocet_procesu, cas_zacatek)
+        else:
+            pozice_smycek = set()
+            zpracovano = 0
+            for pozice in dosazitelne_pozice:
+                zpracovano += 1
+
+                if zpracovano % 10 == 0 or zpracovano == celkem_pozic:
+                    self._vypis_prubeh(zpracovano, celkem_pozic,
+                                       len(pozice_smycek), cas_zacatek)
+
+                if not self._je_kandidat(pozice):
+                    continue
+
+                if self.Detekce_smycky_skoky(pozice, self._prvni_vstupy[pozice]):
+                    pozice_smycek.add(pozice)
     
         celkovy_cas = time() - cas_zacatek
         print(f"\nHledání dokončeno za {celkovy_cas:.1f} sekund")
         print(f"Celkem nalezeno {len(pozice_smycek)} možných pozic pro smyčky")
         
         return pozice_smycek
+
+    def _Najdi_pozice_smycek_paralelne(self, pozice: List[Tuple[int, int]],
+                                       pocet_procesu: int,
+                                       cas_zacatek: float) -> Set[Tuple[int, int]]:
+        """Rozdělí pozice do dávek a zpracuje je v ProcessPoolExecutor."""
+        mrizka = ''.join(''.join(row) for row in self._map_data).encode('ascii')
+        pamet = shared_memory.SharedMemory(create=True, size=len(mrizka))
+        pamet.buf[:len(mrizka)] = mrizka
+
+        ulohy = [(p, self._prvni_vstupy.get(p)) for p in pozice]
+        velikost_davky = max(1, len(ulohy) // (pocet_procesu * 16))
+        davky = [ulohy[i:i + velikost_davky]
+                 for i in range(0, len(ulohy), velikost_davky)]
+        pozice_smycek = set()
+        zpracovano = 0
+
+        try:
+            with ProcessPoolExecutor(
+                    max_workers=pocet_procesu,
+                    initializer=_inicializuj_pracovnika,
+                    initargs=(pamet.name, self.height, self.width)) as executor:
+                futures = [executor.submit(_zpracuj_davku, davka) for davka in davky]
+                for future in as_completed(futures):
+                    nalezene, pocet = future.result()
+                    pozice_smycek.update(nalezene)
+                    zpracovano += pocet
+                    self._vypis_prubeh(zpracovano, len(pozice),
+                                       len(pozice_smycek), cas_zacatek)
+        finally:
+            pamet.close()
+            pamet.unlink()
+
+        return pozice_smycek
+
+
+_pracovni_strazce = None
+
+def _inicializuj_pracovnika(nazev_pameti: str, vyska: int, sirka: int) -> None:
+    """Připojí sdílenou mapu a připraví strážce pro pracovní proces."""
+    global _pracovni_strazce
+    pamet = shared_memory.SharedMemory(name=nazev_pameti)
+    try:
+        mrizka = bytes(pamet.buf[:vyska * sirka]).decode('ascii')
+    finally:
+        pamet.close()
+    map_data = [mrizka[y * sirka:(y + 1) * sirka] for y in range(vyska)]
+    _pracovni_strazce = Pohybstrazce(map_data)
+
+def _zpracuj_davku(davka: List[Tuple[Tuple[int, int], Optional[Tuple[Tuple[int, int], int]]]]
+                   ) -> Tuple[List[Tuple[int, int]], int]:
+    """Vrátí pozice z dávky, které vytvoří smyčku, a počet zpracovaných pozic."""
+    strazce = _pracovni_strazce
+    nalezene = [pozice for pozice, start in davka
+                if strazce._je_kandidat(pozice)
+                and strazce.Detekce_smycky_skoky(pozice, start)]
+    return nalezene, len(davka)
     
 def nacti_data(filename: str) -> str:
     """Načte vstupní data ze souboru."""
@@ -187,20 +357,21 @@ def nacti_data(filename: str) -> str:
         print(f"Nastala chyba při čtení souboru: {e}")
         return ""
 
-def hledani_reseni_cast2(input_data: str) -> int:
+def hledani_reseni_cast2(input_data: str, pocet_procesu: int = 1) -> int:
     """Fce - pro nalezení výsledku druhé části."""
     print("Načítám a zpracovávám vstupní data...")
     map_data = [line.strip() for line in input_data.strip().split('\n')]
     guard = Pohybstrazce(map_data)
-    return len(guard.Najdi_pozice_smycek())
-
-filename = "Day_06/input_06.txt"
-print(f"Načítám soubor: {filename}")
-input_data = nacti_data(filename)
-
-if input_data:
-    print("\nSpouštím řešení části 2...")
-    result = hledani_reseni_cast2(input_data)
-    print(f"\nVÝSLEDEK: Počet možných pozic pro vytvoření smyčky: {result}")
-else:
-    print("Nepodařilo se načíst vstupní data.")
\ No newline at end of file
+    return len(guard.Najdi_pozice_smycek(pocet_procesu))
+
+if __name__ == "__main__":
+    filename = "Day_06/input_06.txt"
+    print(f"Načítám soubor: {filename}")
+    input_data = nacti_data(filename)
+
+    if input_data:
+        print("\nSpouštím řešení části 2...")
+        result = hledani_reseni_cast2(input_data, os.cpu_count() or 1)
+        print(f"\nVÝSLEDEK: Počet možných pozic pro vytvoření smyčky: {result}")
+    else:
+        print("Nepodařilo se načíst vstupní data.")
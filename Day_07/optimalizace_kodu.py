@@ -1,6 +1,7 @@
-from typing import List, Tuple, Set, Optional
-from itertools import product
+from typing import Iterator, List, NamedTuple, Tuple, Set, Optional
+import os
 import re
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from dataclasses import dataclass
 
 @dataclass
@@ -9,6 +10,13 @@ class Rovnice:
     testovaci_hodnota: int
     cisla: List[int]
 
+class VysledekRovnice(NamedTuple):
+    """Výsledek jedné rovnice ze streamovaného zpracování souboru."""
+    cislo_radku: int
+    testovaci_hodnota: int
+    resitelna: bool
+    operatory: Optional[Tuple[str, ...]]
+
 class OpravaMostu:
     def __init__(self, vstupni_data: List[str]):
         """Inicializace se vstupními daty."""
@@ -21,15 +29,21 @@ class OpravaMostu:
         """Parsování vstupních dat do seznamu rovnic."""
         rovnice = []
         for radek in self._surova_data:
-            if not radek.strip():
-                continue
-            shoda = re.match(r'(\d+): (.*)', radek)
-            if shoda:
-                testovaci_hodnota = int(shoda.group(1))
-                cisla = [int(x) for x in shoda.group(2).split()]
-                rovnice.append(Rovnice(testovaci_hodnota, cisla))
+            zpracovana = self._zpracuj_radek(radek)
+            if zpracovana:
+                rovnice.append(zpracovana)
         return rovnice
 
+    @staticmethod
+    def _zpracuj_radek(radek: str) -> Optional[Rovnice]:
+        """Parsování jednoho řádku, prázdný nebo neplatný řádek vrací None."""
+        if not radek.strip():
+            return None
+        shoda = re.match(r'(\d+): (.*)', radek)
+        if not shoda:
+            return None
+        return Rovnice(int(shoda.group(1)), [int(x) for x in shoda.group(2).split()])
+
     def _vypocitej_vyraz(self, cisla: List[int], operatory: List[str]) -> int:
         """Vyhodnocení výrazu s danými operátory."""
         vysledek = cisla[0]
@@ -42,18 +56,46 @@ class OpravaMostu:
                 vysledek = int(str(vysledek) + str(cisla[i + 1]))
         return vysledek
 
+    def _najdi_operatory(self, rovnice: Rovnice,
+                         seznam_operatoru: List[str]) -> Optional[Tuple[str, ...]]:
+        """Najde operátory, se kterými rovnice platí, nebo vrátí None.
+
+        Hledá se pozpátku od testovací hodnoty: poslední číslo se odečte (+),
+        vydělí (*, jen při dělitelnosti) nebo odřízne jako desítková přípona
+        (||). Větve, kde krok nejde vrátit, se zahodí hned, místo aby se
+        zkoušelo všech len(seznam_operatoru)^(n-1) kombinací.
+        """
+        cisla = rovnice.cisla
+        rady = [10 ** len(str(cislo)) for cislo in cisla]
+        scitani = '+' in seznam_operatoru
+        nasobeni = '*' in seznam_operatoru
+        spojeni = '||' in seznam_operatoru
+
+        zasobnik = [(len(cisla) - 1, rovnice.testovaci_hodnota, ())]
+        while zasobnik:
+            i, cil, operatory = zasobnik.pop()
+            cislo = cisla[i]
+            if i == 0:
+                if cil == cislo:
+                    return operatory
+                continue
+
+            if spojeni and cil >= cislo and cil % rady[i] == cislo:
+                zasobnik.append((i - 1, cil // rady[i], ('||',) + operatory))
+            if nasobeni:
+                if cislo == 0:
+                    if cil == 0:
+                        # Násobení nulou dá nulu pro libovolný začátek výrazu
+                        return (seznam_operatoru[0],) * (i - 1) + ('*',) + operatory
+                elif cil % cislo == 0:
+                    zasobnik.append((i - 1, cil // cislo, ('*',) + operatory))
+            if scitani and cil >= cislo:
+                zasobnik.append((i - 1, cil - cislo, ('+',) + operatory))
+        return None
+
     def _je_platna_rovnice(self, rovnice: Rovnice, seznam_operatoru: List[str]) -> bool:
         """Kontrola, zda lze rovnici vyřešit s danými operátory."""
-        pocet_operatoru = len(rovnice.cisla) - 1
-        
-        for ops in product(seznam_operatoru, repeat=pocet_operatoru):
-            try:
-                vysledek = self._vypocitej_vyraz(rovnice.cisla, ops)
-                if vysledek == rovnice.testovaci_hodnota:
-                    return True
-            except ValueError:
-                continue
-        return False
+        return self._najdi_operatory(rovnice, seznam_operatoru) is not None
 
     def vyres_cast1(self) -> int:
         """Řešení první části úlohy."""
@@ -87,6 +129,58 @@ def nacti_data(nazev_souboru: str) -> str:
         print(f"Nastala chyba při čtení souboru: {e}")
         return ""
 
+def _nacti_davky(nazev_souboru: str, velikost_davky: int) -> Iterator[List[Tuple[int, str]]]:
+    """Líně čte soubor a vrací dávky dvojic (číslo řádku, řádek)."""
+    with open(nazev_souboru, 'r') as soubor:
+        davka = []
+        for cislo_radku, radek in enumerate(soubor, start=1):
+            davka.append((cislo_radku, radek))
+            if len(davka) == velikost_davky:
+                yield davka
+                davka = []
+        if davka:
+            yield davka
+
+def _vyres_davku(davka: List[Tuple[int, str]],
+                 seznam_operatoru: List[str]) -> List[VysledekRovnice]:
+    """Vyřeší jednu dávku řádků v pracovním procesu."""
+    resitel = OpravaMostu([])
+    vysledky = []
+    for cislo_radku, radek in davka:
+        rovnice = resitel._zpracuj_radek(radek)
+        if rovnice is None:
+            continue
+        operatory = resitel._najdi_operatory(rovnice, seznam_operatoru)
+        vysledky.append(VysledekRovnice(cislo_radku, rovnice.testovaci_hodnota,
+                                        operatory is not None, operatory))
+    return vysledky
+
+def vyres_soubor_paralelne(nazev_souboru: str, seznam_operatoru: List[str],
+                           pocet_procesu: Optional[int] = None,
+                           velikost_davky: int = 10000) -> Iterator[VysledekRovnice]:
+    """Streamuje výsledky rovnic ze souboru řešených v ProcessPoolExecutor.
+
+    Soubor se čte po dávkách a rozpracovaných je nejvýš dvojnásobek počtu
+    procesů, takže paměť nezávisí na velikosti souboru. Výsledky se vrací
+    v pořadí, v jakém dávky doběhnou, ne v pořadí řádků.
+    """
+    pocet_procesu = pocet_procesu or os.cpu_count() or 1
+    max_rozpracovanych = 2 * pocet_procesu
+    davky = _nacti_davky(nazev_souboru, velikost_davky)
+
+    with ProcessPoolExecutor(max_workers=pocet_procesu) as executor:
+        rozpracovane = set()
+        for davka in davky:
+            rozpracovane.add(executor.submit(_vyres_davku, davka, seznam_operatoru))
+            if len(rozpracovane) >= max_rozpracovanych:
+                hotove, rozpracovane = wait(rozpracovane, return_when=FIRST_COMPLETED)
+                for future in hotove:
+                    yield from future.result()
+        while rozpracovane:
+            hotove, rozpracovane = wait(rozpracovane, return_when=FIRST_COMPLETED)
+            for future in hotove:
+                yield from future.result()
+
 def main():
     # Načtení dat
     nazev_souboru = "Day_07/input_07.txt"
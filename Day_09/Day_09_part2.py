@@ -1,7 +1,10 @@
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple
+import heapq
 import time
 
+MAX_SPAN = 9  # Soubor má nejvýše 9 bloků, delší volné úseky mají společný koš
+
 @dataclass
 class FileInfo:
     id: int
@@ -12,94 +15,99 @@ def parse_disk_map(disk_map: str) -> List[int]:
     """Převede vstupní string na list čísel."""
     return [int(x) for x in disk_map.strip()]
 
-def find_files(blocks: List[int]) -> List[FileInfo]:
-    """Najde všechny soubory a jejich pozice."""
-    files = []
-    current_file = -1
-    current_start = 0
-    current_size = 0
-    
-    for i, block in enumerate(blocks + [-1]):  # Přidáme -1 na konec pro zpracování posledního souboru
-        if block == -1 or (current_file != -1 and block != current_file):
-            if current_file != -1:
-                files.append(FileInfo(current_file, current_start, current_size))
-            if block != -1:
-                current_file = block
-                current_start = i
-                current_size = 1
-            else:
-                current_file = -1
-        elif block != -1:
-            if current_file == -1:
-                current_file = block
-                current_start = i
-                current_size = 1
-            else:
-                current_size += 1
-    
-    # Seřadit podle ID sestupně
-    return sorted(files, key=lambda x: x.id, reverse=True)
+def read_disk_map(filename: str, chunk_size: int = 1 << 20) -> Iterator[int]:
+    """Čte velikosti z mapy disku po blocích, bez načtení celého souboru."""
+    with open(filename, 'rb') as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            for digit in chunk:
+                if 48 <= digit <= 57:  # ignoruje konce řádků a mezery
+                    yield digit - 48
 
-def find_free_space(blocks: List[int], size: int, max_position: int) -> int:
-    """Najde první dostatečně velký volný prostor."""
-    consecutive_space = 0
-    space_start = 0
-    
-    for i in range(max_position):
-        if blocks[i] == -1:
-            if consecutive_space == 0:
-                space_start = i
-            consecutive_space += 1
-            if consecutive_space >= size:
-                return space_start
-        else:
-            consecutive_space = 0
-    
-    return max_position
+def _bucket(length: int) -> int:
+    return length if length < MAX_SPAN else MAX_SPAN
+
+def build_layout(sizes: Iterable[int]) -> Tuple[List[FileInfo], List[List[Tuple[int, int]]]]:
+    """Vytvoří seznam souborů a haldy volných úseků podle jejich délky.
 
-def create_block_representation(sizes: List[int]) -> List[int]:
-    """Vytvoří reprezentaci bloků z velikostí."""
-    blocks = []
-    file_id = 0
+    free_spans[length] je min-halda dvojic (začátek, délka) volných úseků
+    dané délky, poslední koš obsahuje všechny úseky délky MAX_SPAN a více.
+    Mezery oddělené jen prázdným souborem tvoří jeden souvislý úsek.
+    """
+    files = []
+    free_spans = [[] for _ in range(MAX_SPAN + 1)]
+    position = 0
+    free_start = free_length = 0
     
     for i, size in enumerate(sizes):
         if i % 2 == 0:  # soubor
-            blocks.extend([file_id] * size)
-            file_id += 1
+            files.append(FileInfo(i // 2, position, size))
+            if size > 0 and free_length > 0:
+                # seznam je seřazený podle začátku, takže je to platná halda
+                free_spans[_bucket(free_length)].append((free_start, free_length))
+                free_length = 0
         else:  # mezera
-            blocks.extend([-1] * size)
+            if free_length == 0:
+                free_start = position
+            free_length += size
+        position += size
     
-    return blocks
+    if free_length > 0:
+        free_spans[_bucket(free_length)].append((free_start, free_length))
+    
+    return files, free_spans
 
-def move_file(blocks: List[int], file: FileInfo, new_position: int):
-    """Přesune soubor na novou pozici."""
-    # Zapíše soubor na novou pozici
-    blocks[new_position:new_position + file.size] = [file.id] * file.size
-    # Vymaže původní pozici
-    blocks[file.start:file.start + file.size] = [-1] * file.size
+def find_free_space(free_spans: List[List[Tuple[int, int]]], size: int,
+                    max_position: int) -> Optional[Tuple[int, int]]:
+    """Najde nejlevější volný úsek délky alespoň size začínající před max_position.
 
-def calculate_checksum(blocks: List[int]) -> int:
-    """Vypočítá kontrolní součet."""
-    return sum(i * block for i, block in enumerate(blocks) if block != -1)
+    Vrací dvojici (začátek, délka úseku), nebo None. Stačí porovnat vrcholy
+    nejvýše devíti hald.
+    """
+    best = None
+    for bucket in range(size, MAX_SPAN + 1):
+        spans = free_spans[bucket]
+        if spans and spans[0][0] < max_position and (best is None or spans[0] < best):
+            best = spans[0]
+    return best
 
-def solve_disk_defrag_part2(disk_map: str) -> int:
-    """Hlavní funkce řešení."""
-    # Parse vstup
-    sizes = parse_disk_map(disk_map)
-    blocks = create_block_representation(sizes)
-    
-    # Najdi soubory
-    files = find_files(blocks)
+def move_file(free_spans: List[List[Tuple[int, int]]], file: FileInfo, span: Tuple[int, int]):
+    """Přesune soubor do volného úseku a zbytek úseku vrátí do příslušné haldy."""
+    start, length = span
+    heapq.heappop(free_spans[_bucket(length)])
+    if length > file.size:
+        remainder = length - file.size
+        heapq.heappush(free_spans[_bucket(remainder)], (start + file.size, remainder))
+    file.start = start
+
+def calculate_checksum(files: List[FileInfo]) -> int:
+    """Vypočítá kontrolní součet ze záznamů souborů."""
+    return sum(file.id * file.size * (2 * file.start + file.size - 1) // 2 for file in files)
+
+def defragment_checksum(sizes: Iterable[int]) -> int:
+    """Přesune celé soubory do nejlevějších vhodných mezer a vrátí kontrolní součet."""
+    files, free_spans = build_layout(sizes)
     
     # Pro každý soubor od nejvyššího ID
-    for file in files:
+    for file in reversed(files):
+        if file.size == 0:
+            continue
         # Najdi první vhodný volný prostor vlevo
-        new_pos = find_free_space(blocks, file.size, file.start)
-        # Pokud byl nalezen vhodný prostor a je vlevo od současné pozice
-        if new_pos < file.start:
-            move_file(blocks, file, new_pos)
+        span = find_free_space(free_spans, file.size, file.start)
+        if span is not None:
+            move_file(free_spans, file, span)
     
-    return calculate_checksum(blocks)
+    return calculate_checksum(files)
+
+def solve_disk_defrag_part2(disk_map: str) -> int:
+    """Hlavní funkce řešení."""
+    return defragment_checksum(parse_disk_map(disk_map))
+
+def solve_disk_defrag_part2_file(filename: str, chunk_size: int = 1 << 20) -> int:
+    """Řešení ze souboru, v paměti jsou jen záznamy souborů a volných úseků."""
+    return defragment_checksum(read_disk_map(filename, chunk_size))
 
 if __name__ == "__main__":
     # Test na příkladu ze zadání
@@ -109,12 +117,9 @@ if __name__ == "__main__":
     print(f"Test kontrolní součet: {test_result}")  # Mělo by být 2858
     print(f"Test čas: {(time.time() - start_time)*1000:.2f}ms")
     
-    # Načtení a zpracování skutečného vstupu
-    with open("Day_09/input_09.txt", "r") as file:
-        input_data = file.read().strip()
-    
+    # Streamované zpracování skutečného vstupu
     start_time = time.time()
-    result = solve_disk_defrag_part2(input_data)
+    result = solve_disk_defrag_part2_file("Day_09/input_09.txt")
     end_time = time.time()
     
     print(f"Výsledný kontrolní součet: {result}")
@@ -1,10 +1,14 @@
 from array import array
+from typing import BinaryIO, Iterable, Iterator, Tuple
+import io
 
-def parse_disk_map(disk_map: str) -> list:
-    """Převede řetězec mapy disku na seznam bloků s jejich velikostmi."""
-    return [int(x) for x in str(disk_map).strip()]
+_DIGITS = bytes.maketrans(b'0123456789', bytes(range(10)))
 
-def create_block_representation(sizes: list) -> array:
+def parse_disk_map(disk_map: str) -> bytes:
+    """Převede řetězec mapy disku na velikosti bloků, jeden bajt na číslici."""
+    return str(disk_map).strip().encode('ascii').translate(_DIGITS)
+
+def create_block_representation(sizes: bytes) -> array:
     """Vytvoří reprezentaci bloků, kde každý blok je označen ID souboru nebo -1 pro volné místo."""
     blocks = array('i')
     file_id = 0
@@ -16,43 +20,125 @@ def create_block_representation(sizes: list) -> array:
             blocks.extend([-1] * size)
     return blocks
 
-def move_file_left(blocks: array) -> bool:
-    """Pokusí se přesunout jeden soubor zleva doprava."""
-    last_file = None
-    last_file_start = -1
+def range_sum(start: int, length: int) -> int:
+    """Součet pozic start, start + 1, ..., start + length - 1."""
+    return length * (2 * start + length - 1) // 2
+
+def iter_compact_checksum(length: int, forward_chunks: Iterable[bytes],
+                          backward_sizes: Iterator[int]) -> Iterator[int]:
+    """Průběžný kontrolní součet po přesunu bloků zprava do mezer zleva.
+
+    Dva ukazatele procházejí přímo run-length velikosti: levý čte velikosti
+    po částech z forward_chunks a doplňuje mezery bloky souboru, na který
+    ukazuje pravý, čtený pozpátku z backward_sizes. Každý úsek přispěje do
+    součtu vzorcem file_id * range_sum, takže se nikdy nevytváří pole bloků.
+    Po každé zpracované části se vrátí dosavadní součet, poslední hodnota je
+    výsledek.
+    """
+    left = 0
+    right = length - 1 if length % 2 == 1 else length - 2
+    if right < 0:
+        yield 0
+        return
+    if length % 2 == 0:
+        next(backward_sizes)
+    right_remaining = next(backward_sizes)
+    position = 0
+    checksum = 0
     
-    for i in range(len(blocks)-1, -1, -1):
-        if blocks[i] != -1:
-            if last_file is None:
-                last_file = blocks[i]
-                last_file_start = i
-            elif blocks[i] != last_file:
+    for chunk in forward_chunks:
+        for size in chunk:
+            if left >= right:
                 break
-    
-    if last_file is None:
-        return False
-    
-    try:
-        first_space = blocks.index(-1)
-    except ValueError:
-        return False
-    
-    if first_space >= last_file_start:
-        return False
-    
-    file_size = 0
-    for i in range(last_file_start, len(blocks)):
-        if blocks[i] == last_file:
-            file_size += 1
-        else:
+            if left % 2 == 0:
+                checksum += (left // 2) * range_sum(position, size)
+                position += size
+            else:
+                gap = size
+                while gap > 0 and left < right:
+                    moved = min(gap, right_remaining)
+                    checksum += (right // 2) * range_sum(position, moved)
+                    position += moved
+                    gap -= moved
+                    right_remaining -= moved
+                    if right_remaining == 0:
+                        right -= 2
+                        if right > left:
+                            next(backward_sizes)
+                            right_remaining = next(backward_sizes)
+            left += 1
+        if left >= right:
             break
+        yield checksum
     
-    for i in range(last_file_start, last_file_start + file_size):
-        blocks[i] = -1
-    for i in range(first_space, first_space + file_size):
-        blocks[i] = last_file
+    if left == right:
+        checksum += (right // 2) * range_sum(position, right_remaining)
     
-    return True
+    yield checksum
+
+def compact_checksum(sizes: bytes) -> int:
+    """Kontrolní součet po kompaktaci mapy disku uložené v paměti."""
+    checksum = 0
+    for checksum in iter_compact_checksum(len(sizes), (sizes,), reversed(sizes)):
+        pass
+    return checksum
+
+def _digit_bounds(file: BinaryIO, chunk_size: int) -> Tuple[int, int]:
+    """Vrátí rozsah bajtů [begin, end) mapy disku bez okolních bílých znaků."""
+    file.seek(0, io.SEEK_END)
+    end = file.tell()
+    while end > 0:
+        start = max(0, end - chunk_size)
+        file.seek(start)
+        stripped = len(file.read(end - start).rstrip())
+        end = start + stripped
+        if stripped:
+            break
+    begin = 0
+    while begin < end:
+        file.seek(begin)
+        chunk = file.read(min(chunk_size, end - begin))
+        skipped = len(chunk) - len(chunk.lstrip())
+        begin += skipped
+        if skipped < len(chunk):
+            break
+    return begin, end
+
+def _read_forward(file: BinaryIO, begin: int, end: int, chunk_size: int) -> Iterator[bytes]:
+    """Čte velikosti zleva po částech velikosti chunk_size."""
+    file.seek(begin)
+    while begin < end:
+        chunk = file.read(min(chunk_size, end - begin))
+        begin += len(chunk)
+        yield chunk.translate(_DIGITS)
+
+def _read_backward(file: BinaryIO, begin: int, end: int, chunk_size: int) -> Iterator[int]:
+    """Čte velikosti zprava po částech velikosti chunk_size."""
+    while end > begin:
+        start = max(begin, end - chunk_size)
+        file.seek(start)
+        chunk = file.read(end - start).translate(_DIGITS)
+        end = start
+        yield from reversed(chunk)
+
+def iter_disk_defrag_file(filename: str, chunk_size: int = 1 << 20) -> Iterator[int]:
+    """Streamovaný kontrolní součet mapy disku ze souboru.
+
+    Soubor se čte zleva i zprava po blocích chunk_size bajtů, takže špičková
+    paměť nezávisí na velikosti mapy. Vrací průběžný součet po každém bloku.
+    """
+    with open(filename, 'rb') as forward, open(filename, 'rb') as backward:
+        begin, end = _digit_bounds(forward, chunk_size)
+        yield from iter_compact_checksum(end - begin,
+                                         _read_forward(forward, begin, end, chunk_size),
+                                         _read_backward(backward, begin, end, chunk_size))
+
+def solve_disk_defrag_file(filename: str, chunk_size: int = 1 << 20) -> int:
+    """Kontrolní součet mapy disku ze souboru s omezenou pamětí."""
+    checksum = 0
+    for checksum in iter_disk_defrag_file(filename, chunk_size):
+        pass
+    return checksum
 
 def calculate_checksum(blocks: array) -> int:
     """Vypočítá kontrolní součet podle zadaných pravidel."""
@@ -60,13 +146,7 @@ def calculate_checksum(blocks: array) -> int:
 
 def solve_disk_defrag(disk_map: str) -> int:
     """Hlavní funkce řešení."""
-    sizes = parse_disk_map(disk_map)
-    blocks = create_block_representation(sizes)
-    
-    while move_file_left(blocks):
-        pass
-    
-    return calculate_checksum(blocks)
+    return compact_checksum(parse_disk_map(disk_map))
 
 def print_blocks(blocks):
     """Vytiskne reprezentaci bloků pro debugging."""
@@ -77,8 +157,5 @@ if __name__ == "__main__":
     test_result = solve_disk_defrag(test_input)
     print(f"Test kontrolní součet: {test_result}")
     
-    with open("Day_09/input_09.txt", "r") as file:
-        input_data = file.read().strip()
-    
-    result = solve_disk_defrag(input_data)
+    result = solve_disk_defrag_file("Day_09/input_09.txt")
     print(f"Výsledný kontrolní součet: {result}")
\ No newline at end of file
@@ -1,46 +1,43 @@
-from collections import deque
-from typing import List, Set, Tuple
+from typing import List, Tuple
 
-def find_hiking_trails(grid: List[List[int]]) -> int:
-    def is_valid(x: int, y: int) -> bool:
-        return 0 <= x < len(grid) and 0 <= y < len(grid[0])
+def analyze_trailheads(grid: List[List[int]]) -> Tuple[int, int]:
+    """Spočítá součet skóre a součet hodnocení všech trailheadů v jednom průchodu.
+
+    Buňky se zpracují po vrstvách od výšky 9 dolů. Každá buňka dostane
+    bitovou množinu dosažitelných vrcholů (Python int, jeden bit na vrchol)
+    a počet různých cest k vrcholům, obojí složené z vyšších sousedů.
+    """
+    rows, cols = len(grid), len(grid[0])
+    heights = [height for row in grid for height in row]
+    layers = [[] for _ in range(10)]
+    for cell, height in enumerate(heights):
+        layers[height].append(cell)
     
-    def get_neighbors(x: int, y: int) -> List[Tuple[int, int]]:
-        directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # vpravo, dolů, vlevo, nahoru
-        return [(x + dx, y + dy) for dx, dy in directions if is_valid(x + dx, y + dy)]
+    reachable = [0] * (rows * cols)
+    paths = [0] * (rows * cols)
+    for bit, cell in enumerate(layers[9]):
+        reachable[cell] = 1 << bit
+        paths[cell] = 1
     
-    def find_reachable_nines(start_x: int, start_y: int) -> int:
-        visited = set()
-        reachable_nines = set()
-        queue = deque([(start_x, start_y, [(start_x, start_y)])])
-        
-        while queue:
-            x, y, path = queue.popleft()
-            current_height = grid[x][y]
-            
-            if current_height == 9:
-                reachable_nines.add((x, y))
-                continue
-                
-            for next_x, next_y in get_neighbors(x, y):
-                if grid[next_x][next_y] == current_height + 1 and (next_x, next_y) not in visited:
-                    visited.add((next_x, next_y))
-                    new_path = path + [(next_x, next_y)]
-                    queue.append((next_x, next_y, new_path))
-        
-        return len(reachable_nines)
+    for height in range(8, -1, -1):
+        for cell in layers[height]:
+            x, y = divmod(cell, cols)
+            summits = 0
+            count = 0
+            for neighbor, valid in ((cell + 1, y + 1 < cols), (cell + cols, x + 1 < rows),
+                                    (cell - 1, y > 0), (cell - cols, x > 0)):
+                if valid and heights[neighbor] == height + 1:
+                    summits |= reachable[neighbor]
+                    count += paths[neighbor]
+            reachable[cell] = summits
+            paths[cell] = count
     
-    # Najít všechny trailheady (pozice s výškou 0)
-    total_score = 0
-    rows, cols = len(grid), len(grid[0])
-    
-    for i in range(rows):
-        for j in range(cols):
-            if grid[i][j] == 0:
-                score = find_reachable_nines(i, j)
-                total_score += score
-                
-    return total_score
+    total_score = sum(reachable[cell].bit_count() for cell in layers[0])
+    total_rating = sum(paths[cell] for cell in layers[0])
+    return total_score, total_rating
+
+def find_hiking_trails(grid: List[List[int]]) -> int:
+    return analyze_trailheads(grid)[0]
 
 # Funkce pro načtení vstupu
 def parse_input(input_str: str) -> List[List[int]]:
@@ -1,6 +1,8 @@
 from typing import List, Set, Dict, Tuple
 from collections import defaultdict
 
+import numpy as np
+
 def count_distinct_paths(grid: List[List[int]]) -> int:
     def is_valid(x: int, y: int) -> bool:
         return 0 <= x < len(grid) and 0 <= y < len(grid[0])
@@ -51,9 +53,36 @@ def count_distinct_paths(grid: List[List[int]]) -> int:
                 
     return total_rating
 
+def count_distinct_paths_numpy(heights: np.ndarray) -> int:
+    """Vektorizovaná verze count_distinct_paths pro velké mapy.
+
+    Drží jen počty cest pro jednu výškovou vrstvu: počty vrstvy h se získají
+    sečtením čtyř posunutých kopií vrstvy h + 1 a vynulováním buněk jiné výšky.
+    Z jedné buňky vede nejvýše 4^9 cest, takže stačí int32.
+    """
+    current = (heights == 9).astype(np.int32)
+    following = np.empty_like(current)
+    
+    for height in range(8, -1, -1):
+        following.fill(0)
+        np.add(following[:, :-1], current[:, 1:], out=following[:, :-1])
+        np.add(following[:, 1:], current[:, :-1], out=following[:, 1:])
+        np.add(following[:-1, :], current[1:, :], out=following[:-1, :])
+        np.add(following[1:, :], current[:-1, :], out=following[1:, :])
+        following *= heights == height
+        current, following = following, current
+    
+    return int(current.sum(dtype=np.int64))
+
 def parse_input(input_str: str) -> List[List[int]]:
     return [[int(char) for char in line] for line in input_str.strip().split('\n')]
 
+def parse_input_array(input_str: str) -> np.ndarray:
+    """Načte mapu přímo do pole uint8 bez seznamů Python intů."""
+    lines = input_str.strip().split('\n')
+    data = np.frombuffer(''.join(line.strip() for line in lines).encode('ascii'), dtype=np.uint8)
+    return (data - ord('0')).reshape(len(lines), -1)
+
 # Test na příkladu ze zadání
 test_input = """89010123
 78121874
@@ -66,4 +95,5 @@ test_input = """89010123
 
 grid = parse_input(test_input)
 result = count_distinct_paths(grid)
-print(f"Výsledek pro testovací vstup: {result}")  # Mělo by vypsat 81
\ No newline at end of file
+print(f"Výsledek pro testovací vstup: {result}")  # Mělo by vypsat 81
+print(f"Vektorizovaný výsledek: {count_distinct_paths_numpy(parse_input_array(test_input))}")
\ No newline at end of file
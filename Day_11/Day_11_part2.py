@@ -1,22 +1,31 @@
+from bisect import bisect_right
 from collections import defaultdict
-from typing import Dict
+from typing import Dict, Iterable, List, Optional, Tuple
 
-def transform_zero(stone: str) -> list[str]:
-    return ['1']
+import numpy as np
 
-def split_even_digits(stone: str) -> list[str]:
-    if len(stone) % 2 == 0:
-        mid = len(stone) // 2
-        left = str(int(stone[:mid]))
-        right = str(int(stone[mid:]))
-        return [left, right]
-    return []
+_POWERS_OF_TEN: List[int] = [10 ** k for k in range(1, 40)]
 
-def multiply_by_2024(stone: str) -> list[str]:
-    return [str(int(stone) * 2024)]
+def digit_count(stone: int) -> int:
+    """Počet číslic kamene bez převodu na řetězec."""
+    while stone >= _POWERS_OF_TEN[-1]:
+        _POWERS_OF_TEN.append(_POWERS_OF_TEN[-1] * 10)
+    return bisect_right(_POWERS_OF_TEN, stone) + 1
 
-def transform_stone(stone: str) -> list[str]:
-    if stone == '0':
+def transform_zero(stone: int) -> Tuple[int, ...]:
+    return (1,)
+
+def split_even_digits(stone: int) -> Tuple[int, ...]:
+    digits = digit_count(stone)
+    if digits % 2 == 0:
+        return divmod(stone, _POWERS_OF_TEN[digits // 2 - 1])
+    return ()
+
+def multiply_by_2024(stone: int) -> Tuple[int, ...]:
+    return (stone * 2024,)
+
+def transform_stone(stone: int) -> Tuple[int, ...]:
+    if stone == 0:
         return transform_zero(stone)
     
     split_result = split_even_digits(stone)
@@ -25,7 +34,7 @@ def transform_stone(stone: str) -> list[str]:
     
     return multiply_by_2024(stone)
 
-def blink_once(stone_counts: Dict[str, int]) -> Dict[str, int]:
+def blink_once(stone_counts: Dict[int, int]) -> Dict[int, int]:
     new_counts = defaultdict(int)
     
     for stone, count in stone_counts.items():
@@ -38,7 +47,7 @@ def blink_once(stone_counts: Dict[str, int]) -> Dict[str, int]:
 def simulate_blinks(stones: list[str], num_blinks: int) -> int:
     stone_counts = defaultdict(int)
     for stone in stones:
-        stone_counts[stone] += 1
+        stone_counts[int(stone)] += 1
     
     for i in range(num_blinks):
         stone_counts = blink_once(stone_counts)
@@ -48,7 +57,176 @@ def simulate_blinks(stones: list[str], num_blinks: int) -> int:
     
     return sum(stone_counts.values())
 
+class StoneCounter:
+    """Počítá kameny po N mrknutích pro libovolné počáteční kameny.
+
+    Pamatuje si počty po vrstvách: levels[k][i] je počet kamenů, které
+    vzniknou z hodnoty values[i] po k mrknutích. Hodnoty tvoří uzavřenou
+    množinu (potomci každé hodnoty jsou v ní také), takže vrstva k + 1 se
+    spočítá z vrstvy k jedním průchodem. Dotaz na N mrknutí tak stojí
+    O(hodnoty * N) bez ohledu na to, jak velké jsou výsledné počty.
+
+    max_cache_size omezuje počet uložených čísel (hodnoty * vrstvy). Pro
+    1000 mrknutí a ~3850 hodnot je to asi 3,9 milionu čísel, proto je
+    výchozí paměť neomezená. S menším limitem se vrstvy nad ním neukládají
+    a počítají se průběžně jen se dvěma vrstvami v paměti. Každý dotaz je
+    pak přepočítá znovu, ale jen lineárně k počtu mrknutí, nikdy ne
+    exponenciálně jako paměť po jednotlivých kamenech s vyhazováním.
+    """
+
+    def __init__(self, max_cache_size: Optional[int] = None):
+        self.max_cache_size = max_cache_size
+        self._index: Dict[int, int] = {}
+        # Indexy potomků každé hodnoty, chybějící druhý potomek je -1
+        # a ukazuje na nulu na konci každé vrstvy
+        self._first: List[int] = []
+        self._second: List[int] = []
+        self._levels: List[List[int]] = [[0]]
+
+    def _fits(self, level_count: int) -> bool:
+        return (self.max_cache_size is None
+                or level_count * len(self._first) <= self.max_cache_size)
+
+    def _next_level(self, previous: List[int]) -> List[int]:
+        level = [previous[a] + previous[b] for a, b in zip(self._first, self._second)]
+        level.append(0)
+        return level
+
+    def _add_values(self, stones: Iterable[int]) -> None:
+        """Doplní hodnoty dosažitelné z kamenů a dopočítá pro ně uložené vrstvy."""
+        start = len(self._first)
+        frontier = {stone for stone in stones if stone not in self._index}
+        new_values = []
+        while frontier:
+            for value in frontier:
+                self._index[value] = len(self._index)
+                new_values.append(value)
+            frontier = {child for value in frontier for child in transform_stone(value)
+                        if child not in self._index}
+        if not new_values:
+            return
+
+        for value in new_values:
+            children = [self._index[child] for child in transform_stone(value)]
+            self._first.append(children[0])
+            self._second.append(children[1] if len(children) > 1 else -1)
+
+        while len(self._levels) > 1 and not self._fits(len(self._levels)):
+            self._levels.pop()
+        # Vrstva 0 jsou samé jedničky, vyšší vrstvy se doplní postupně
+        self._levels[0][-1:] = [1] * len(new_values) + [0]
+        for k in range(1, len(self._levels)):
+            previous, level = self._levels[k - 1], self._levels[k]
+            level[-1:] = [previous[self._first[i]] + previous[self._second[i]]
+                          for i in range(start, len(self._first))] + [0]
+
+    def count_stones(self, stones: Iterable[int], blinks: int) -> int:
+        stones = [int(stone) for stone in stones]
+        self._add_values(stones)
+        while len(self._levels) <= blinks and self._fits(len(self._levels) + 1):
+            self._levels.append(self._next_level(self._levels[-1]))
+
+        if blinks < len(self._levels):
+            level = self._levels[blinks]
+        else:
+            level = self._levels[-1]
+            for _ in range(blinks - len(self._levels) + 1):
+                level = self._next_level(level)
+        return sum(level[self._index[stone]] for stone in stones)
+
+    def count(self, stone: int, blinks: int) -> int:
+        """Počet kamenů, které vzniknou z jednoho kamene po blinks mrknutích."""
+        return self.count_stones([stone], blinks)
+
+def discover_closed_set(stones: Iterable[int]) -> List[int]:
+    """Najde všechny hodnoty kamenů, které mohou ze zadaných kamenů vzniknout.
+
+    Pro běžné vstupy se množina uzavře po několika desítkách mrknutí a má
+    nanejvýš několik tisíc hodnot.
+    """
+    seen = set()
+    frontier = {int(stone) for stone in stones}
+    while frontier:
+        seen |= frontier
+        frontier = {child for stone in frontier for child in transform_stone(stone)} - seen
+    return sorted(seen)
+
+def build_transition_matrix(values: List[int]) -> np.ndarray:
+    """Matice přechodu T, kde T[i, j] je počet kamenů values[j] vzniklých z values[i]."""
+    index = {value: i for i, value in enumerate(values)}
+    transition = np.zeros((len(values), len(values)), dtype=np.int64)
+    for i, value in enumerate(values):
+        for child in transform_stone(value):
+            transition[i, index[child]] += 1
+    return transition
+
+_LIMB_BITS = 20
+_EXACT_FLOAT = 1 << 53
+MAX_MODULUS = 1 << (2 * _LIMB_BITS)
+
+def _matmul_mod(a: np.ndarray, b: np.ndarray, modulus: int) -> np.ndarray:
+    """Součin a @ b modulo modulus přes float64 BLAS, přesně pro modulus <= 2^40.
+
+    Pokud by součty součinů mohly přesáhnout 2^53, rozdělí se prvky na dvě
+    20bitové části a vnitřní rozměr se zpracuje po blocích.
+    """
+    inner = a.shape[1]
+    if (modulus - 1) ** 2 * inner < _EXACT_FLOAT:
+        return np.rint(a.astype(np.float64) @ b.astype(np.float64)).astype(np.int64) % modulus
+
+    block = _EXACT_FLOAT >> (2 * _LIMB_BITS)
+    mask = (1 << _LIMB_BITS) - 1
+    a_parts = ((a & mask).astype(np.float64), (a >> _LIMB_BITS).astype(np.float64))
+    b_parts = ((b & mask).astype(np.float64), (b >> _LIMB_BITS).astype(np.float64))
+
+    def product(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        result = np.zeros((x.shape[0], y.shape[1]), dtype=np.int64)
+        for start in range(0, inner, block):
+            part = x[:, start:start + block] @ y[start:start + block, :]
+            result = (result + np.rint(part).astype(np.int64)) % modulus
+        return result
+
+    def shift(x: np.ndarray) -> np.ndarray:
+        return (x << _LIMB_BITS) % modulus
+
+    low = product(a_parts[0], b_parts[0])
+    middle = (product(a_parts[0], b_parts[1]) + product(a_parts[1], b_parts[0])) % modulus
+    high = product(a_parts[1], b_parts[1])
+    return (low + shift(middle) + shift(shift(high))) % modulus
+
+def simulate_blinks_matrix(stones: list[str], num_blinks: int,
+                           modulus: Optional[int] = None) -> int:
+    """Počet kamenů po num_blinks mrknutích umocňováním matice přechodu.
+
+    S modulem se výsledek počítá modulo modulus pomocí O(log N) maticových
+    součinů. Bez modulu mají přesné počty Θ(N) číslic a každý součin by
+    pracoval s obřími čísly, proto se přesný výsledek počítá krokováním
+    blink_once po uzavřené množině hodnot.
+    """
+    if modulus is None:
+        return simulate_blinks(stones, num_blinks)
+    if not 1 <= modulus <= MAX_MODULUS:
+        raise ValueError(f"Modulus musí být v rozsahu 1..{MAX_MODULUS}")
+
+    values = discover_closed_set(int(stone) for stone in stones)
+    index = {value: i for i, value in enumerate(values)}
+    counts = np.zeros((1, len(values)), dtype=np.int64)
+    for stone in stones:
+        counts[0, index[int(stone)]] += 1
+    counts %= modulus
+
+    power = build_transition_matrix(values) % modulus
+    remaining = num_blinks
+    while remaining:
+        if remaining & 1:
+            counts = _matmul_mod(counts, power, modulus)
+        remaining >>= 1
+        if remaining:
+            power = _matmul_mod(power, power, modulus)
+
+    return int(counts.sum() % modulus)
+
 # Test
 initial_stones = "5 127 680267 39260 0 26 3553 5851995".split()
 result = simulate_blinks(initial_stones, 75)
-print(f"Final number of stones: {result}")
\ No newline at end of file
+print(f"Final number of stones: {result}")
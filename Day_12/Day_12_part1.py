@@ -1,7 +1,8 @@
 import tkinter as tk
 from tkinter import ttk
-from typing import List, Set, Tuple, Dict
-from collections import defaultdict
+from typing import List
+
+from garden_regions import GardenRegions
 
 class GardenVisualizer:
     def __init__(self, root):
@@ -21,7 +22,7 @@ class GardenVisualizer:
         try:
             self.garden_map = self.read_garden_map("Day_12/input_12.txt")
             self.create_layout()
-            self.regions = self.find_regions()
+            self.regions = GardenRegions(self.garden_map)
             self.analyze_garden()
             self.draw_garden()
         except Exception as e:
@@ -107,131 +108,21 @@ class GardenVisualizer:
         self.total_label2 = ttk.Label(self.total_frame, text="Celková cena (Part 2): 0")
         self.total_label2.pack()
 
-    def count_sides(self, region: Set[Tuple[int, int]], plant: str) -> int:
-        """Spočítá počet souvislých stran regionu pro Part 2"""
-        # Nejdřív najdeme všechny hraniční buňky a jejich strany
-        border_cells = set()
-        for x, y in region:
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                nx, ny = x + dx, y + dy
-                if (nx, ny) not in region:
-                    if (nx < 0 or ny < 0 or 
-                        ny >= len(self.garden_map) or 
-                        nx >= len(self.garden_map[0]) or
-                        self.garden_map[ny][nx] != plant):
-                        border_cells.add((x, y))
-        
-        # Funkce pro nalezení souvislé strany začínající v daném bodě a směru
-        def trace_side(start_x: int, start_y: int, direction: str) -> Set[Tuple[int, int]]:
-            visited = set()
-            current = (start_x, start_y)
-            side = {current}
-            
-            # Mapování směrů na offsety
-            if direction == 'H':  # horizontální
-                next_moves = [(1, 0), (-1, 0)]
-                check_dirs = [(0, 1), (0, -1)]
-            else:  # vertikální
-                next_moves = [(0, 1), (0, -1)]
-                check_dirs = [(1, 0), (-1, 0)]
-            
-            while True:
-                x, y = current
-                found_next = False
-                
-                # Kontrola, zda jsme stále na hranici
-                is_border = False
-                for dx, dy in check_dirs:
-                    nx, ny = x + dx, y + dy
-                    if (nx, ny) not in region:
-                        if (nx < 0 or ny < 0 or 
-                            ny >= len(self.garden_map) or 
-                            nx >= len(self.garden_map[0]) or
-                            self.garden_map[ny][nx] != plant):
-                            is_border = True
-                            break
-                
-                if not is_border:
-                    break
-                    
-                # Hledání další buňky v této straně
-                for dx, dy in next_moves:
-                    nx, ny = x + dx, y + dy
-                    if (nx, ny) in border_cells and (nx, ny) not in visited:
-                        # Kontrola, zda je nová buňka součástí stejné strany
-                        is_same_side = False
-                        for check_dx, check_dy in check_dirs:
-                            check_x, check_y = nx + check_dx, ny + check_dy
-                            if (check_x, check_y) not in region:
-                                if (check_x < 0 or check_y < 0 or 
-                                    check_y >= len(self.garden_map) or 
-                                    check_x >= len(self.garden_map[0]) or
-                                    self.garden_map[check_y][check_x] != plant):
-                                    is_same_side = True
-                                    break
-                        
-                        if is_same_side:
-                            current = (nx, ny)
-                            visited.add(current)
-                            side.add(current)
-                            found_next = True
-                            break
-                
-                if not found_next:
-                    break
-            
-            return side
-        
-        # Najdeme všechny souvislé strany
-        used_cells = set()
-        sides = 0
-        
-        for x, y in border_cells:
-            if (x, y) in used_cells:
-                continue
-                
-            # Zkusíme začít horizontální stranu
-            horizontal_side = trace_side(x, y, 'H')
-            if len(horizontal_side) > 0:
-                sides += 1
-                used_cells.update(horizontal_side)
-                continue
-                
-            # Zkusíme začít vertikální stranu
-            vertical_side = trace_side(x, y, 'V')
-            if len(vertical_side) > 0:
-                sides += 1
-                used_cells.update(vertical_side)
-                continue
-                
-            # Pokud buňka není součástí delší strany, je to samostatná strana
-            if (x, y) not in used_cells:
-                sides += 1
-                used_cells.add((x, y))
-        
-        return sides
-
     def analyze_garden(self):
         """Analyzuje zahradu a aktualizuje UI s oběma metodami výpočtu"""
         total_price1 = 0  # Part 1
         total_price2 = 0  # Part 2
         self.tree.delete(*self.tree.get_children())
         
-        region_count = 1
-        for plant, plant_regions in self.regions.items():
-            for region in plant_regions:
-                area = len(region)
-                perimeter = self.calculate_perimeter(region, plant)
-                sides = self.count_sides(region, plant)
-                price1 = area * perimeter  # Part 1
-                price2 = area * sides      # Part 2
-                total_price1 += price1
-                total_price2 += price2
-                
-                self.tree.insert('', 'end',
-                               values=(f"{plant}-{region_count}", 
-                                     area, perimeter, sides, price1, price2))
-                region_count += 1
+        for region_count, region in enumerate(self.regions.regions(), start=1):
+            price1 = region.price       # Part 1
+            price2 = region.bulk_price  # Part 2
+            total_price1 += price1
+            total_price2 += price2
+            
+            self.tree.insert('', 'end',
+                           values=(f"{region.plant}-{region_count}", 
+                                 region.area, region.perimeter, region.sides, price1, price2))
         
         self.total_label1.config(text=f"Celková cena (Part 1): {total_price1}")
         self.total_label2.config(text=f"Celková cena (Part 2): {total_price2}")
@@ -245,56 +136,6 @@ class GardenVisualizer:
         with open(filename, 'r') as f:
             return [line.strip() for line in f.readlines()]
     
-    def find_regions(self) -> dict:
-        height = len(self.garden_map)
-        width = len(self.garden_map[0])
-        visited = set()
-        regions = defaultdict(list)
-        
-        def flood_fill(x: int, y: int, plant: str) -> Set[Tuple[int, int]]:
-            if (x, y) in visited or self.garden_map[y][x] != plant:
-                return set()
-            
-            region = {(x, y)}
-            visited.add((x, y))
-            stack = [(x, y)]
-            
-            while stack:
-                curr_x, curr_y = stack.pop()
-                for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                    new_x, new_y = curr_x + dx, curr_y + dy
-                    if (0 <= new_x < width and 0 <= new_y < height and
-                            (new_x, new_y) not in visited and
-                            self.garden_map[new_y][new_x] == plant):
-                        visited.add((new_x, new_y))
-                        region.add((new_x, new_y))
-                        stack.append((new_x, new_y))
-            
-            return region
-
-        for y in range(height):
-            for x in range(width):
-                if (x, y) not in visited:
-                    plant = self.garden_map[y][x]
-                    region = flood_fill(x, y, plant)
-                    if region:
-                        regions[plant].append(region)
-        
-        return regions
-    
-    def calculate_perimeter(self, region: Set[Tuple[int, int]], plant: str) -> int:
-        perimeter = 0
-        for x, y in region:
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                nx, ny = x + dx, y + dy
-                if (nx, ny) not in region:
-                    if (nx < 0 or ny < 0 or 
-                        ny >= len(self.garden_map) or 
-                        nx >= len(self.garden_map[0]) or
-                        self.garden_map[ny][nx] != plant):
-                        perimeter += 1
-        return perimeter
-    
     def draw_garden(self):
         self.canvas.delete('all')
         
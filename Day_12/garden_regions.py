@@ -0,0 +1,270 @@
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Set, Tuple
+
+DIRECTIONS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+DIAGONALS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+@dataclass
+class Region:
+    plant: str
+    area: int
+    perimeter: int
+    sides: int
+
+    @property
+    def price(self) -> int:
+        """Cena plotu podle obvodu (Part 1)."""
+        return self.area * self.perimeter
+
+    @property
+    def bulk_price(self) -> int:
+        """Cena plotu podle počtu stran (Part 2)."""
+        return self.area * self.sides
+
+class GardenRegions:
+    """Označení regionů zahrady bez GUI.
+
+    Regiony se najdou union-find průchodem po řádcích (každá buňka se spojí
+    s levým a horním sousedem stejné rostliny). Plocha, obvod a počet stran
+    se pak sečtou jedním průchodem do plochých polí indexovaných kořenem
+    regionu. Počet stran se rovná počtu rohů regionu.
+
+    Buňka odkazuje přes label na id regionu a union-find běží nad id, ne nad
+    buňkami. Při rozpadu regionu po úpravě tak stačí odtrženým buňkám
+    přidělit nová id a stromy ostatních buněk zůstanou platné.
+    """
+
+    def __init__(self, garden_map: List[str]):
+        self.height = len(garden_map)
+        self.width = len(garden_map[0])
+        self.plants = [plant for row in garden_map for plant in row]
+
+        size = self.width * self.height
+        self.label = array('i', range(size))
+        self.parent = array('i', range(size))
+        self.plant_of = list(self.plants)
+        self.area = array('i', [1]) * size  # během spojování slouží jako velikost
+        self.perimeter = array('i', bytes(4 * size))
+        self.sides = array('i', bytes(4 * size))
+
+        self._label()
+        self._measure()
+
+    def find(self, region_id: int) -> int:
+        """Kořen id regionu (s půlením cesty)."""
+        parent = self.parent
+        while parent[region_id] != region_id:
+            parent[region_id] = parent[parent[region_id]]
+            region_id = parent[region_id]
+        return region_id
+
+    def root_of(self, cell: int) -> int:
+        return self.find(self.label[cell])
+
+    def _new_region(self, plant: str) -> int:
+        region_id = len(self.parent)
+        self.parent.append(region_id)
+        self.plant_of.append(plant)
+        self.area.append(0)
+        self.perimeter.append(0)
+        self.sides.append(0)
+        return region_id
+
+    def _union(self, a: int, b: int) -> int:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        if self.area[a] < self.area[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.area[a] += self.area[b]
+        self.perimeter[a] += self.perimeter[b]
+        self.sides[a] += self.sides[b]
+        return a
+
+    def _label(self):
+        width, plants, label = self.width, self.plants, self.label
+        for y in range(self.height):
+            for x in range(width):
+                cell = y * width + x
+                if x > 0 and plants[cell - 1] == plants[cell]:
+                    self._union(label[cell], label[cell - 1])
+                if y > 0 and plants[cell - width] == plants[cell]:
+                    self._union(label[cell], label[cell - width])
+
+    def _same(self, x: int, y: int, plant: str) -> bool:
+        return (0 <= x < self.width and 0 <= y < self.height
+                and self.plants[y * self.width + x] == plant)
+
+    def cell_fences(self, x: int, y: int) -> Tuple[int, int]:
+        """Počet hran plotu a počet rohů regionu, které patří buňce (x, y)."""
+        plant = self.plants[y * self.width + x]
+        edges = 0
+        for dx, dy in DIRECTIONS:
+            if not self._same(x + dx, y + dy, plant):
+                edges += 1
+        corners = 0
+        for dx, dy in DIAGONALS:
+            horizontal = self._same(x + dx, y, plant)
+            vertical = self._same(x, y + dy, plant)
+            if not horizontal and not vertical:
+                corners += 1  # vypuklý roh
+            elif horizontal and vertical and not self._same(x + dx, y + dy, plant):
+                corners += 1  # vydutý roh
+        return edges, corners
+
+    def _measure(self):
+        for y in range(self.height):
+            for x in range(self.width):
+                root = self.root_of(y * self.width + x)
+                edges, corners = self.cell_fences(x, y)
+                self.perimeter[root] += edges
+                self.sides[root] += corners
+
+        self.total_price = self.total_bulk_price = 0
+        for root in self.roots():
+            self.total_price += self.area[root] * self.perimeter[root]
+            self.total_bulk_price += self.area[root] * self.sides[root]
+
+    def _plant_neighbors(self, cell: int, plant: str) -> List[int]:
+        y, x = divmod(cell, self.width)
+        return [ny * self.width + nx for dx, dy in DIRECTIONS
+                for nx, ny in ((x + dx, y + dy),) if self._same(nx, ny, plant)]
+
+    def _move_fences(self, cells: Set[int], sign: int):
+        """Přičte (sign=1) nebo odečte (sign=-1) příspěvky buněk k jejich regionům."""
+        for cell in cells:
+            y, x = divmod(cell, self.width)
+            root = self.root_of(cell)
+            edges, corners = self.cell_fences(x, y)
+            self.perimeter[root] += sign * edges
+            self.sides[root] += sign * corners
+
+    def _update_totals(self, roots: Set[int], sign: int):
+        for root in roots:
+            self.total_price += sign * self.area[root] * self.perimeter[root]
+            self.total_bulk_price += sign * self.area[root] * self.sides[root]
+
+    def _split_components(self, starts: List[int], plant: str) -> List[Set[int]]:
+        """Najde komponenty, které se po odebrání buňky oddělily od regionu.
+
+        Z každého souseda běží vlastní prohledávání a všechna se střídají po
+        jednom kroku. Jakmile zbývá jediná skupina, která ještě neskončila,
+        ostatní jsou kompletní odtržené komponenty. Práce je tak úměrná
+        velikosti menších částí, ne celého regionu.
+        """
+        if not starts:
+            return []
+        group = list(range(len(starts)))
+
+        def find_group(i: int) -> int:
+            while group[i] != i:
+                group[i] = group[group[i]]
+                i = group[i]
+            return i
+
+        owner: Dict[int, int] = {}
+        visited: List[Set[int]] = [set() for _ in starts]
+        queues = [[start] for start in starts]
+        for i, start in enumerate(starts):
+            if start in owner:
+                group[find_group(i)] = find_group(owner[start])
+            else:
+                owner[start] = i
+                visited[i].add(start)
+
+        def running_groups() -> Set[int]:
+            return {find_group(i) for i in range(len(starts)) if queues[i]}
+
+        while len(running_groups()) > 1:
+            for i in range(len(starts)):
+                if not queues[i]:
+                    continue
+                cell = queues[i].pop()
+                for neighbor in self._plant_neighbors(cell, plant):
+                    other = owner.get(neighbor)
+                    if other is None:
+                        owner[neighbor] = i
+                        visited[i].add(neighbor)
+                        queues[i].append(neighbor)
+                    elif find_group(other) != find_group(i):
+                        group[find_group(other)] = find_group(i)
+
+        survivors = running_groups()
+        components: Dict[int, Set[int]] = {}
+        for i in range(len(starts)):
+            components.setdefault(find_group(i), set()).update(visited[i])
+        if not survivors:
+            # Všechna prohledávání doběhla, největší část si ponechá původní id
+            survivors = {max(components, key=lambda g: len(components[g]))}
+        return [cells for g, cells in components.items() if g not in survivors]
+
+    def set_plot(self, x: int, y: int, plant: str):
+        """Změní rostlinu na pozici (x, y) a lokálně aktualizuje regiony a ceny.
+
+        Přepočítají se jen příspěvky buněk v okolí 3x3, sloučení sousedních
+        regionů řeší union-find a případný rozpad starého regionu omezené
+        prohledávání z původních sousedů.
+        """
+        cell = y * self.width + x
+        old_plant = self.plants[cell]
+        if old_plant == plant:
+            return
+
+        nearby = {ny * self.width + nx
+                  for ny in range(max(0, y - 1), min(self.height, y + 2))
+                  for nx in range(max(0, x - 1), min(self.width, x + 2))}
+        touched = {self.root_of(near) for near in nearby}
+        self._update_totals(touched, -1)
+        self._move_fences(nearby, -1)
+
+        old_root = self.root_of(cell)
+        self.area[old_root] -= 1
+        self.plants[cell] = plant
+
+        for component in self._split_components(self._plant_neighbors(cell, old_plant), old_plant):
+            region_id = self._new_region(old_plant)
+            for member in component:
+                self.label[member] = region_id
+            self.area[region_id] = len(component)
+            self.area[old_root] -= len(component)
+            # Buňky mimo okolí mají stejné příspěvky jako před úpravou
+            far = component - nearby
+            for member in far:
+                my, mx = divmod(member, self.width)
+                edges, corners = self.cell_fences(mx, my)
+                self.perimeter[old_root] -= edges
+                self.sides[old_root] -= corners
+                self.perimeter[region_id] += edges
+                self.sides[region_id] += corners
+
+        region_id = self._new_region(plant)
+        self.label[cell] = region_id
+        self.area[region_id] = 1
+        for neighbor in self._plant_neighbors(cell, plant):
+            self._union(self.label[neighbor], region_id)
+
+        self._move_fences(nearby, 1)
+        self._update_totals({self.root_of(near) for near in nearby}, 1)
+
+    def roots(self) -> List[int]:
+        """Kořeny všech regionů v pořadí jejich první buňky."""
+        seen = set()
+        roots = []
+        for cell in range(len(self.plants)):
+            root = self.root_of(cell)
+            if root not in seen:
+                seen.add(root)
+                roots.append(root)
+        return roots
+
+    def region(self, root: int) -> Region:
+        return Region(self.plant_of[root], self.area[root], self.perimeter[root], self.sides[root])
+
+    def regions(self) -> List[Region]:
+        return [self.region(root) for root in self.roots()]
+
+    def total_prices(self) -> Tuple[int, int]:
+        """Celková cena plotů pro Part 1 a Part 2."""
+        return self.total_price, self.total_bulk_price
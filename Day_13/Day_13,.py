@@ -1,6 +1,11 @@
 from typing import Tuple, Optional
 from math import gcd
 
+import numpy as np
+
+# Převodní tabulka, která nahradí všechny znaky kromě číslic a minusu mezerou
+_DIGITS_ONLY = bytes(c if 48 <= c <= 57 or c == ord('-') else 32 for c in range(256))
+
 def extended_gcd(a: int, b: int) -> Tuple[int, int, int]:
     """
     Rozšířený Euklidův algoritmus pro nalezení řešení ax + by = gcd(a,b)
@@ -15,6 +20,66 @@ def extended_gcd(a: int, b: int) -> Tuple[int, int, int]:
     
     return gcd, x, y
 
+def solve_colinear(button_a: Tuple[int, int], button_b: Tuple[int, int],
+                   target: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+    """
+    Řeší případ rovnoběžných tlačítek (coef == 0), kdy soustava přejde
+    na jedinou rovnici a * A + b * B = t podél společné přímky.
+    
+    Všechna celočíselná řešení jsou A = A0 + k * b/g, B = B0 - k * a/g.
+    Podmínky A >= 0 a B >= 0 dají dolní a horní mez k a cena 3A + B se
+    s k mění lineárně, takže minimum leží na jedné z mezí. Vrací (A, B)
+    nebo None.
+    """
+    ax, ay = button_a
+    bx, by = button_b
+    tx, ty = target
+    
+    # Rovnice pro osu, na které aspoň jedno tlačítko něco dělá
+    a, b, t = (ax, bx, tx) if ax or bx else (ay, by, ty)
+    if a == 0 and b == 0:
+        return (0, 0) if tx == 0 and ty == 0 else None
+    
+    g, x, y = extended_gcd(abs(a), abs(b))
+    if t % g != 0:
+        return None
+    
+    A0 = (x if a >= 0 else -x) * (t // g)
+    B0 = (y if b >= 0 else -y) * (t // g)
+    step_a, step_b = b // g, a // g
+    
+    low = high = None
+    if step_a > 0:
+        low = -(A0 // step_a)
+    elif step_a < 0:
+        high = A0 // -step_a
+    elif A0 < 0:
+        return None
+    if step_b > 0:
+        high = B0 // step_b if high is None else min(high, B0 // step_b)
+    elif step_b < 0:
+        bound = -(B0 // -step_b)
+        low = bound if low is None else max(low, bound)
+    elif B0 < 0:
+        return None
+    if low is not None and high is not None and low > high:
+        return None
+    
+    # Cena roste s k -> nejmenší k, klesá -> největší k, stálá -> kterákoli mez
+    slope = 3 * step_a - step_b
+    k = low if slope > 0 or (slope == 0 and low is not None) else high
+        
+    A = A0 + k * step_a
+    B = B0 - k * step_b
+    if A < 0 or B < 0:
+        return None
+        
+    # Cíl musí ležet na přímce tlačítek i ve druhé souřadnici
+    if (A*ax + B*bx == tx) and (A*ay + B*by == ty):
+        return (A, B)
+        
+    return None
+
 def solve_system(button_a: Tuple[int, int], button_b: Tuple[int, int], 
                 target: Tuple[int, int]) -> Optional[Tuple[int, int]]:
     """
@@ -31,7 +96,7 @@ def solve_system(button_a: Tuple[int, int], button_b: Tuple[int, int],
     
     coef = ay*bx - ax*by
     if coef == 0:  
-        return None
+        return solve_colinear(button_a, button_b, target)
         
     right_side = ay*tx - ax*ty
     
@@ -83,6 +148,120 @@ def parse_input(text: str, add_large_number: bool = False) -> list[tuple[Tuple[i
             
     return machines
 
+def parse_input_arrays(text: str, add_large_number: bool = False) -> np.ndarray:
+    """Zpracuje vstupní text na pole tvaru (n, 6) se sloupci ax, ay, bx, by, tx, ty.
+
+    Pole je int64, pokud se do něj vejdou všechny mezivýsledky Cramerova
+    pravidla, jinak object s Python inty.
+    """
+    numbers = text.encode('ascii').translate(_DIGITS_ONLY).split()
+    machines = np.array(numbers, dtype=np.int64).reshape(-1, 6)
+    large_number = 10**13 if add_large_number else 0
+    if not len(machines):
+        return machines
+    
+    buttons_max = int(np.abs(machines[:, :4]).max())
+    targets_max = int(np.abs(machines[:, 4:]).max()) + large_number
+    if 2 * buttons_max * targets_max >= 2**63:
+        machines = machines.astype(object)
+    machines[:, 4:] += large_number
+    return machines
+
+def extended_gcd_arrays(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Rozšířený Euklidův algoritmus po prvcích pro nezáporná pole, vrací (gcd, x, y)."""
+    old_r, r = a, b
+    old_x, x = np.ones_like(a), np.zeros_like(a)
+    old_y, y = np.zeros_like(a), np.ones_like(a)
+    while (r != 0).any():
+        active = r != 0
+        q = np.where(active, old_r // np.where(active, r, 1), 0)
+        old_r, r = np.where(active, r, old_r), np.where(active, old_r - q*r, r)
+        old_x, x = np.where(active, x, old_x), np.where(active, old_x - q*x, x)
+        old_y, y = np.where(active, y, old_y), np.where(active, old_y - q*y, y)
+    return old_r, old_x, old_y
+
+def solve_colinear_batch(machines: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vektorizovaná verze solve_colinear pro řádky s rovnoběžnými tlačítky."""
+    ax, ay, bx, by, tx, ty = (machines[:, i] for i in range(6))
+    use_x = (ax != 0) | (bx != 0)
+    a = np.where(use_x, ax, ay)
+    b = np.where(use_x, bx, by)
+    t = np.where(use_x, tx, ty)
+    
+    g, x, y = extended_gcd_arrays(np.abs(a), np.abs(b))
+    degenerate = g == 0
+    safe_g = np.where(degenerate, 1, g)
+    solvable = ~degenerate & (t % safe_g == 0)
+    
+    A0 = np.where(a >= 0, x, -x) * (t // safe_g)
+    B0 = np.where(b >= 0, y, -y) * (t // safe_g)
+    step_a, step_b = b // safe_g, a // safe_g
+    safe_a = np.where(step_a != 0, np.abs(step_a), 1)
+    safe_b = np.where(step_b != 0, np.abs(step_b), 1)
+    
+    # Meze k z podmínek A >= 0 a B >= 0, jejich existenci udávají has_low a has_high
+    has_low = (step_a > 0) | (step_b < 0)
+    has_high = (step_a < 0) | (step_b > 0)
+    low_a, high_a = -(A0 // safe_a), A0 // safe_a
+    low_b, high_b = -(B0 // safe_b), B0 // safe_b
+    low = np.where(step_a > 0, np.where(step_b < 0, np.maximum(low_a, low_b), low_a), low_b)
+    high = np.where(step_a < 0, np.where(step_b > 0, np.minimum(high_a, high_b), high_a), high_b)
+    solvable &= np.where(step_a == 0, A0 >= 0, True) & np.where(step_b == 0, B0 >= 0, True)
+    solvable &= ~(has_low & has_high) | (low <= high)
+    
+    slope = 3*step_a - step_b
+    take_low = has_low & ((slope > 0) | (slope == 0))
+    k = np.where(take_low, low, np.where(has_high, high, 0))
+    
+    a_presses = A0 + k*step_a
+    b_presses = B0 - k*step_b
+    solvable &= (a_presses >= 0) & (b_presses >= 0)
+    solvable &= (a_presses*ax + b_presses*bx == tx) & (a_presses*ay + b_presses*by == ty)
+    
+    # Obě tlačítka nulová: řešení je jen nulový cíl bez stisknutí
+    zero_target = degenerate & (tx == 0) & (ty == 0)
+    a_presses = np.where(degenerate, 0, a_presses)
+    b_presses = np.where(degenerate, 0, b_presses)
+    return a_presses, b_presses, solvable | zero_target
+
+def solve_batch(machines: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vektorizovaná verze solve_system pro všechny automaty najednou.
+
+    Cramerovým pravidlem spočítá počty stisků A a B pro každý řádek pole
+    z parse_input_arrays, rovnoběžná tlačítka dořeší solve_colinear_batch.
+    Vrací (A, B, řešitelné), kde A a B platí jen tam, kde je řešitelné True.
+    """
+    ax, ay, bx, by, tx, ty = (machines[:, i] for i in range(6))
+    coef = ay*bx - ax*by
+    nonzero = coef != 0
+    safe_coef = np.where(nonzero, coef, 1)
+    
+    numerator_a = bx*ty - by*tx
+    numerator_b = ay*tx - ax*ty
+    solvable = nonzero & (numerator_a % safe_coef == 0) & (numerator_b % safe_coef == 0)
+    
+    a_presses = numerator_a // safe_coef
+    b_presses = numerator_b // safe_coef
+    solvable &= (a_presses >= 0) & (b_presses >= 0)
+    
+    colinear = np.flatnonzero(~nonzero)
+    if colinear.size:
+        a_colinear, b_colinear, solvable_colinear = solve_colinear_batch(machines[colinear])
+        a_presses[colinear] = a_colinear
+        b_presses[colinear] = b_colinear
+        solvable[colinear] = solvable_colinear
+    return a_presses, b_presses, solvable
+
+def calculate_total_cost_batch(machines: np.ndarray) -> int:
+    """Celková minimální cena řešitelných automatů bez smyčky v Pythonu.
+
+    Ceny se sčítají jako Python inty, součet přes mnoho automatů by
+    v int64 přetekl.
+    """
+    a_presses, b_presses, solvable = solve_batch(machines)
+    costs = a_presses[solvable].astype(object) * 3 + b_presses[solvable].astype(object)
+    return int(costs.sum())
+
 def calculate_total_cost(machines: list, part: int) -> int:
     """Spočítá celkovou minimální cenu pro všechny řešitelné automaty"""
     total_cost = 0
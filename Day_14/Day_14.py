@@ -1,55 +1,41 @@
-from dataclasses import dataclass
-from typing import List, Tuple
+import re
+from typing import Tuple
 
-@dataclass
-class Robot:
-    x: int
-    y: int
-    vx: int
-    vy: int
+import numpy as np
 
 def read_input(filename: str) -> str:
     with open(filename, 'r') as file:
         return file.read().strip()
 
-def parse_input(input_text: str) -> List[Robot]:
-    robots = []
-    for line in input_text.strip().split('\n'):
-        pos, vel = line.split()
-        x, y = map(int, pos[2:].split(','))
-        vx, vy = map(int, vel[2:].split(','))
-        robots.append(Robot(x, y, vx, vy))
-    return robots
+def parse_input(input_text: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Vrátí pole pozic a rychlostí robotů, obě tvaru (n, 2) se sloupci x, y."""
+    values = np.array(re.findall(r'-?\d+', input_text), dtype=np.int64).reshape(-1, 4)
+    return values[:, :2].copy(), values[:, 2:].copy()
 
-def simulate_step(robots: List[Robot], width: int, height: int):
-    for robot in robots:
-        robot.x = (robot.x + robot.vx) % width
-        robot.y = (robot.y + robot.vy) % height
+def positions_at(positions: np.ndarray, velocities: np.ndarray, t: int,
+                 width: int, height: int) -> np.ndarray:
+    """Pozice všech robotů v čase t bez krokování: (p + v*t) % (W, H)."""
+    size = np.array((width, height), dtype=np.int64)
+    # t se redukuje zvlášť pro každou osu, aby v*t nepřeteklo ani pro obří t
+    steps = np.array((t % width, t % height), dtype=np.int64)
+    return (positions + velocities * steps) % size
 
-def count_robots_in_quadrants(robots: List[Robot], width: int, height: int) -> Tuple[int, int, int, int]:
+def count_robots_in_quadrants(positions: np.ndarray, width: int, height: int) -> Tuple[int, int, int, int]:
     mid_x = width // 2
     mid_y = height // 2
+    x, y = positions[:, 0], positions[:, 1]
     
-    quadrants = [0] * 4
+    mask = (x != mid_x) & (y != mid_y)
+    quadrant = (y[mask] > mid_y) * 2 + (x[mask] > mid_x)
+    quadrants = np.bincount(quadrant, minlength=4)
     
-    for robot in robots:
-        if robot.x == mid_x or robot.y == mid_y:
-            continue
-            
-        quad_x = 1 if robot.x > mid_x else 0
-        quad_y = 1 if robot.y > mid_y else 0
-        quadrant = quad_y * 2 + quad_x
-        quadrants[quadrant] += 1
-    
-    return tuple(quadrants)
+    return tuple(int(count) for count in quadrants)
 
 def solve(input_text: str, width: int = 101, height: int = 103, steps: int = 100) -> int:
-    robots = parse_input(input_text)
-    
-    for _ in range(steps):
-        simulate_step(robots, width, height)
+    positions, velocities = parse_input(input_text)
+    positions = positions_at(positions, velocities, steps, width, height)
     
-    q1, q2, q3, q4 = count_robots_in_quadrants(robots, width, height)
+    q1, q2, q3, q4 = count_robots_in_quadrants(positions, width, height)
     return q1 * q2 * q3 * q4
 
 input_data = read_input("Day_14/input_14.txt")
@@ -1,7 +1,9 @@
 import pygame
 import sys
-from dataclasses import dataclass
-from typing import List
+import re
+from typing import Tuple
+
+import numpy as np
 
 WIDTH = 101
 HEIGHT = 103
@@ -9,28 +11,83 @@ SCALE = 8
 WINDOW_WIDTH = WIDTH * SCALE
 WINDOW_HEIGHT = HEIGHT * SCALE
 FPS = 10
+# Velikost bloku pro entropii celého snímku; histogram po jednotlivých
+# buňkách má pro ~500 robotů skoro samé nuly a jedničky a stromek nepozná
+ENTROPY_BLOCK = 8
 
-@dataclass
-class Robot:
-    x: float  
-    y: float
-    vx: int
-    vy: int
-
-def parse_input(filename: str) -> List[Robot]:
-    robots = []
+def parse_input(filename: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Vrátí pole pozic a rychlostí robotů, obě tvaru (n, 2) se sloupci x, y."""
     with open(filename, 'r') as f:
-        for line in f:
-            pos, vel = line.strip().split()
-            x, y = map(int, pos[2:].split(','))
-            vx, vy = map(int, vel[2:].split(','))
-            robots.append(Robot(float(x), float(y), vx, vy))
-    return robots
-
-def simulate_step(robots: List[Robot]):
-    for robot in robots:
-        robot.x = (robot.x + robot.vx) % WIDTH
-        robot.y = (robot.y + robot.vy) % HEIGHT
+        values = np.array(re.findall(r'-?\d+', f.read()), dtype=np.int64).reshape(-1, 4)
+    return values[:, :2].copy(), values[:, 2:].copy()
+
+def positions_at(positions: np.ndarray, velocities: np.ndarray, t: int) -> np.ndarray:
+    """Pozice všech robotů v čase t bez krokování: (p + v*t) % (W, H)."""
+    steps = np.array((t % WIDTH, t % HEIGHT), dtype=np.int64)
+    return (positions + velocities * steps) % np.array((WIDTH, HEIGHT), dtype=np.int64)
+
+def _entropy(counts: np.ndarray, total: int) -> np.ndarray:
+    """Shannonova entropie histogramů v řádcích pole counts."""
+    p = counts / total
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return -np.where(p > 0, p * np.log(p), 0.0).sum(axis=1)
+
+def axis_scores(coords: np.ndarray, velocities: np.ndarray, size: int,
+                metric: str = 'variance') -> np.ndarray:
+    """Skóre jedné osy pro všechny časy 0..size-1 (nižší = uspořádanější).
+
+    Souřadnice na ose se opakuje s periodou size, takže stačí size snímků.
+    """
+    t = np.arange(size, dtype=np.int64)[:, None]
+    frames = (coords[None, :] + velocities[None, :] * t) % size
+    if metric == 'variance':
+        return frames.var(axis=1)
+    if metric == 'entropy':
+        offsets = (t * size).ravel()[:, None]
+        counts = np.bincount((frames + offsets).ravel(), minlength=size * size)
+        return _entropy(counts.reshape(size, size), coords.size)
+    raise ValueError(f"Neznámá metrika: {metric}")
+
+def frame_scores(positions: np.ndarray, velocities: np.ndarray,
+                 metric: str = 'variance', batch_size: int = 256) -> np.ndarray:
+    """Skóre všech WIDTH*HEIGHT různých snímků, počítané po dávkách.
+
+    Entropie se počítá z histogramu bloků ENTROPY_BLOCK x ENTROPY_BLOCK.
+    """
+    period = WIDTH * HEIGHT
+    blocks_x = -(-WIDTH // ENTROPY_BLOCK)
+    block_count = blocks_x * -(-HEIGHT // ENTROPY_BLOCK)
+    size = np.array((WIDTH, HEIGHT), dtype=np.int64)
+    scores = np.empty(period)
+    for start in range(0, period, batch_size):
+        t = np.arange(start, min(start + batch_size, period), dtype=np.int64)
+        steps = np.stack((t % WIDTH, t % HEIGHT), axis=1)[:, None, :]
+        frames = (positions[None, :, :] + velocities[None, :, :] * steps) % size
+        if metric == 'variance':
+            scores[t] = frames.var(axis=1).sum(axis=1)
+        elif metric == 'entropy':
+            blocks = (frames[:, :, 1] // ENTROPY_BLOCK) * blocks_x + frames[:, :, 0] // ENTROPY_BLOCK
+            cells = blocks + (t - start)[:, None] * block_count
+            counts = np.bincount(cells.ravel(), minlength=len(t) * block_count)
+            scores[t] = _entropy(counts.reshape(len(t), block_count), len(positions))
+        else:
+            raise ValueError(f"Neznámá metrika: {metric}")
+    return scores
+
+def find_easter_egg(positions: np.ndarray, velocities: np.ndarray,
+                    metric: str = 'variance', use_crt: bool = True) -> int:
+    """Najde čas snímku s vánočním stromkem bez vizualizace.
+
+    S use_crt se nejlepší čas hledá zvlášť pro osu x (perioda WIDTH) a osu y
+    (perioda HEIGHT) a oba se spojí čínskou větou o zbytcích, tedy
+    WIDTH + HEIGHT snímků místo WIDTH * HEIGHT.
+    """
+    if not use_crt:
+        return int(np.argmin(frame_scores(positions, velocities, metric)))
+    tx = int(np.argmin(axis_scores(positions[:, 0], velocities[:, 0], WIDTH, metric)))
+    ty = int(np.argmin(axis_scores(positions[:, 1], velocities[:, 1], HEIGHT, metric)))
+    # t ≡ tx (mod WIDTH), t ≡ ty (mod HEIGHT)
+    return tx + WIDTH * ((ty - tx) * pow(WIDTH, -1, HEIGHT) % HEIGHT)
 
 class Visualizer:
     def __init__(self):
@@ -40,7 +97,7 @@ class Visualizer:
         self.clock = pygame.time.Clock()
         self.font = pygame.font.Font(None, 36)
         
-        self.robots = parse_input("Day_14/input_14.txt")
+        self.positions, self.velocities = parse_input("Day_14/input_14.txt")
         self.time = 0
         self.paused = True
         self.speed = 1.0
@@ -55,7 +112,6 @@ class Visualizer:
                 elif event.key == pygame.K_RIGHT and self.paused:
                     self.step()
                 elif event.key == pygame.K_r:  # Reset
-                    self.robots = parse_input("Day_14/input_14.txt")
                     self.time = 0
                 elif event.key == pygame.K_UP:
                     self.speed = min(5.0, self.speed + 0.1)
@@ -64,16 +120,13 @@ class Visualizer:
         return True
 
     def step(self):
-        simulate_step(self.robots)
         self.time += 1
 
     def draw(self):
         self.screen.fill((0, 0, 0))
         
-        for robot in self.robots:
-            x = int(robot.x * SCALE)
-            y = int(robot.y * SCALE)
-            pygame.draw.circle(self.screen, (255, 0, 0), (x, y), 2)
+        for x, y in positions_at(self.positions, self.velocities, self.time) * SCALE:
+            pygame.draw.circle(self.screen, (255, 0, 0), (int(x), int(y)), 2)
         
         # Informační panel
         info_text = f"Čas: {self.time}s  Rychlost: {self.speed:.1f}x  {'PAUZA' if self.paused else 'BĚŽÍ'}"
@@ -97,6 +150,10 @@ class Visualizer:
         pygame.quit()
 
 def main():
+    if "--search" in sys.argv:
+        positions, velocities = parse_input("Day_14/input_14.txt")
+        print(f"Vánoční stromek v čase: {find_easter_egg(positions, velocities)}s")
+        return
     viz = Visualizer()
     viz.run()
 
@@ -1,74 +1,93 @@
-from collections import defaultdict
-from heapq import heappush, heappop
-from dataclasses import dataclass
-from typing import List, Dict, Tuple
+from array import array
+from typing import Iterable, List, Optional, Tuple
 
-@dataclass(frozen=True, order=True)
-class State:
-    x: int
-    y: int
-    direction: int  # 0=východ, 1=jih, 2=západ, 3=sever
+# Směry pohybu (východ, jih, západ, sever)
+DX = (1, 0, -1, 0)
+DY = (0, 1, 0, -1)
+TURN_COST = 1000
+UNREACHED = 2**62
 
 def load_maze(filename: str) -> List[str]:
     with open(filename, 'r') as f:
         return [line.strip() for line in f.readlines()]
 
-def solve_maze(maze: List[str]) -> int:
-    # Najít start a cíl
-    start_x = start_y = end_x = end_y = 0
-    height = len(maze)
+def find_start_end(maze: List[str]) -> Tuple[int, int]:
+    """Vrátí indexy buněk y * W + x startu S a cíle E."""
     width = len(maze[0])
-    
-    for y in range(height):
-        for x in range(width):
-            if maze[y][x] == 'S':
-                start_x, start_y = x, y
-            elif maze[y][x] == 'E':
-                end_x, end_y = x, y
+    start = end = 0
+    for y, row in enumerate(maze):
+        for x, tile in enumerate(row):
+            if tile == 'S':
+                start = y * width + x
+            elif tile == 'E':
+                end = y * width + x
+    return start, end
 
-    # Směry pohybu (východ, jih, západ, sever)
-    dx = [1, 0, -1, 0]
-    dy = [0, 1, 0, -1]
+def distance_field(maze: List[str], sources: Iterable[int], reverse: bool = False,
+                   stop_cell: Optional[int] = None) -> array:
+    """
+    Dijkstra nad stavy (buňka, směr) zakódovanými jako (y * W + x) * 4 + směr.
     
-    # Prioritní fronta pro Dijkstru: (cost, state)
-    pq = [(0, 0, State(start_x, start_y, 0))]  # přidáno unikátní ID pro stabilní řazení
-    costs = {}
-    counter = 1  # pro generování unikátních ID
+    Vzdálenosti leží v plochém poli array('q') (8 bajtů na stav). Hrany mají
+    cenu jen 1 (krok vpřed) nebo 1000 (otočení), takže místo haldy stačí
+    Dialova fronta: kruh 1001 přihrádek indexovaných cenou modulo 1001.
+    S reverse=True se kroky berou pozpátku (vzdálenost do zdrojů).
+    Se stop_cell výpočet skončí po vyřízení prvního stavu v této buňce.
+    """
+    height, width = len(maze), len(maze[0])
+    size = height * width
+    walls = bytes(tile == '#' for row in maze for tile in row)
+    sign = -1 if reverse else 1
+    steps = tuple(sign * (DY[d] * width + DX[d]) for d in range(4))
     
-    while pq:
-        cost, _, current_state = heappop(pq)
-        
-        # Pokud jsme tento stav už viděli s nižší cenou, přeskočíme ho
-        if current_state in costs and cost >= costs[current_state]:
-            continue
-        
-        costs[current_state] = cost
-        
-        # Jsme v cíli?
-        if current_state.x == end_x and current_state.y == end_y:
-            return cost
+    distances = array('q', [UNREACHED]) * (size * 4)
+    buckets = [[] for _ in range(TURN_COST + 1)]
+    pending = 0
+    for state in sources:
+        distances[state] = 0
+        buckets[0].append(state)
+        pending += 1
+    
+    cost = 0
+    while pending:
+        bucket = buckets[cost % (TURN_COST + 1)]
+        while bucket:
+            state = bucket.pop()
+            pending -= 1
+            if distances[state] != cost:
+                continue  # zastaralý záznam, stav už má nižší cenu
+            
+            cell, direction = state >> 2, state & 3
+            if cell == stop_cell:
+                return distances
             
-        # Pohyb vpřed
-        new_x = current_state.x + dx[current_state.direction]
-        new_y = current_state.y + dy[current_state.direction]
-        if (0 <= new_x < width and 0 <= new_y < height and 
-            maze[new_y][new_x] != '#'):
-            new_state = State(new_x, new_y, current_state.direction)
-            new_cost = cost + 1
-            if new_state not in costs or new_cost < costs[new_state]:
-                heappush(pq, (new_cost, counter, new_state))
-                counter += 1
-        
-        # Otočení vlevo a vpravo
-        for new_direction in [(current_state.direction - 1) % 4,
-                            (current_state.direction + 1) % 4]:
-            new_state = State(current_state.x, current_state.y, new_direction)
-            new_cost = cost + 1000
-            if new_state not in costs or new_cost < costs[new_state]:
-                heappush(pq, (new_cost, counter, new_state))
-                counter += 1
+            # Krok vpřed (u východu/západu nesmí přeskočit na jiný řádek)
+            step = steps[direction]
+            neighbor = cell + step
+            if (0 <= neighbor < size and not walls[neighbor]
+                    and (step in (width, -width) or neighbor // width == cell // width)):
+                next_state = neighbor * 4 + direction
+                if cost + 1 < distances[next_state]:
+                    distances[next_state] = cost + 1
+                    buckets[(cost + 1) % (TURN_COST + 1)].append(next_state)
+                    pending += 1
+            
+            # Otočení vlevo a vpravo
+            for next_state in (cell * 4 + ((direction - 1) & 3), cell * 4 + ((direction + 1) & 3)):
+                if cost + TURN_COST < distances[next_state]:
+                    distances[next_state] = cost + TURN_COST
+                    buckets[(cost + TURN_COST) % (TURN_COST + 1)].append(next_state)
+                    pending += 1
+        cost += 1
+    
+    return distances
 
-    return float('inf')
+def solve_maze(maze: List[str]) -> int:
+    start, end = find_start_end(maze)
+    # Start je otočený na východ
+    distances = distance_field(maze, [start * 4], stop_cell=end)
+    best = min(distances[end * 4:end * 4 + 4])
+    return best if best < UNREACHED else float('inf')
 
 def main():
     # Načtení a řešení hlavního vstupu
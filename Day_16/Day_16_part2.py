@@ -1,63 +1,35 @@
-from collections import deque, defaultdict
-from typing import List, Set, Tuple, Dict
+from typing import List, Set
+
+from Day_16 import UNREACHED, distance_field, find_start_end
 
 def load_maze(filename: str) -> List[str]:
     with open(filename, 'r') as f:
         return [line.strip() for line in f.readlines()]
 
 def find_best_paths(maze: List[str]) -> Set[tuple[int, int]]:
-    height = len(maze)
+    """
+    Vrátí všechna políčka (x, y), která leží na některé nejlevnější cestě.
+    
+    Dijkstra běží jednou od S (otočeného na východ) a jednou pozpátku od E
+    ve všech směrech. Stav (buňka, směr) leží na nejlepší cestě právě tehdy,
+    když součet obou vzdáleností je roven optimu.
+    """
     width = len(maze[0])
+    start, end = find_start_end(maze)
     
-    # Najít start a cíl
-    start_x = start_y = end_x = end_y = 0
-    for y in range(height):
-        for x in range(width):
-            if maze[y][x] == 'S':
-                start_x, start_y = x, y
-            elif maze[y][x] == 'E':
-                end_x, end_y = x, y
-
-    # Směry pohybu
-    directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # vpravo, dolů, vlevo, nahoru
+    from_start = distance_field(maze, [start * 4])
+    to_end = distance_field(maze, [end * 4 + direction for direction in range(4)], reverse=True)
     
-    # BFS
-    queue = deque([(start_x, start_y, [(start_x, start_y)])])
-    visited = set()
-    best_paths = []
-    min_length = float('inf')
+    best = min(from_start[end * 4:end * 4 + 4])
+    if best >= UNREACHED:
+        return set()
     
-    while queue:
-        x, y, path = queue.popleft()
-        
-        # Jsme v cíli?
-        if x == end_x and y == end_y:
-            path_length = len(path)
-            if path_length < min_length:
-                min_length = path_length
-                best_paths = [path]
-            elif path_length == min_length:
-                best_paths.append(path)
-            continue
-            
-        # Pokud je cesta už delší než nejlepší nalezená, ignorujeme ji
-        if len(path) > min_length:
-            continue
-            
-        for dx, dy in directions:
-            new_x, new_y = x + dx, y + dy
-            
-            if (0 <= new_x < width and 0 <= new_y < height and 
-                maze[new_y][new_x] != '#' and 
-                (new_x, new_y) not in path):  # Vyhýbáme se cyklům
-                new_path = path + [(new_x, new_y)]
-                queue.append((new_x, new_y, new_path))
-
-    # Shromáždit všechna unikátní políčka ze všech nejlepších cest
     path_tiles = set()
-    for path in best_paths:
-        path_tiles.update(path)
-        
+    for state, cost in enumerate(from_start):
+        if cost + to_end[state] == best:
+            y, x = divmod(state >> 2, width)
+            path_tiles.add((x, y))
+            
     return path_tiles
 
 def visualize_paths(maze: List[str], path_tiles: Set[tuple[int, int]]) -> None:
@@ -1,5 +1,9 @@
+from functools import lru_cache
+
+import numpy as np
+
 class ThreeBitComputer:
-    def __init__(self, register_a=0, register_b=0, register_c=0):
+    def __init__(self, register_a=0, register_b=0, register_c=0, trace_size=0):
         self.registers = {
             'A': register_a,
             'B': register_b,
@@ -7,6 +11,11 @@ class ThreeBitComputer:
         }
         self.outputs = []
         self.instruction_pointer = 0
+        
+        # Kruhový buffer záznamů (ip, opcode, operand, A, B, C) po každé
+        # instrukci. Bez trace_size se nealokuje a run_program ho neřeší.
+        self._trace = [None] * trace_size if trace_size else None
+        self._trace_count = 0
 
     def get_combo_value(self, operand):
         """
@@ -75,6 +84,9 @@ class ThreeBitComputer:
         if isinstance(program, str):
             program = [int(x.strip()) for x in program.split(',')]
         
+        if self._trace is not None:
+            return self._run_traced(program)
+        
         while self.instruction_pointer < len(program):
             opcode = program[self.instruction_pointer]
             operand = program[self.instruction_pointer + 1]
@@ -82,6 +94,328 @@ class ThreeBitComputer:
         
         return ','.join(self.outputs)
 
+    def _run_traced(self, program):
+        trace = self._trace
+        size = len(trace)
+        registers = self.registers
+        
+        while self.instruction_pointer < len(program):
+            ip = self.instruction_pointer
+            opcode = program[ip]
+            operand = program[ip + 1]
+            self.run_instruction(opcode, operand)
+            trace[self._trace_count % size] = (ip, opcode, operand,
+                                              registers['A'], registers['B'], registers['C'])
+            self._trace_count += 1
+        
+        return ','.join(self.outputs)
+
+    def trace_records(self):
+        """
+        Vrátí zaznamenané kroky od nejstaršího po nejnovější, nejvýše
+        posledních trace_size kroků
+        """
+        if self._trace is None:
+            return []
+        size = len(self._trace)
+        if self._trace_count <= size:
+            return self._trace[:self._trace_count]
+        start = self._trace_count % size
+        return self._trace[start:] + self._trace[:start]
+
+    def run_compiled(self, program):
+        """
+        Stejné jako run_program, ale program běží přes compile_program
+        místo interpretu po jednotlivých instrukcích
+        """
+        outputs, a, b, c, ip = compile_program(program)(
+            self.registers['A'], self.registers['B'], self.registers['C'])
+        self.registers = {'A': a, 'B': b, 'C': c}
+        self.outputs.extend(str(value) for value in outputs)
+        self.instruction_pointer = ip
+        return ','.join(self.outputs)
+
+_COMBO_SOURCE = {0: '0', 1: '1', 2: '2', 3: '3', 4: 'a', 5: 'b', 6: 'c'}
+
+def _instruction_source(opcode, operand):
+    """
+    Přeloží jednu instrukci (kromě jnz) na řádek Pythonu nad lokálními
+    proměnnými a, b, c. Dělení mocninou dvou je posun doprava.
+    """
+    if opcode == 1:
+        return f'b ^= {operand}'
+    if opcode == 4:
+        return 'b ^= c'
+    
+    combo = _COMBO_SOURCE.get(operand)
+    if combo is None:
+        return 'raise ValueError("Neplatný combo operand")'
+    if opcode == 0:
+        return f'a >>= {combo}'
+    if opcode == 2:
+        return f'b = {combo} & 7'
+    if opcode == 5:
+        return f'append({combo} & 7)'
+    if opcode == 6:
+        return f'b = a >> {combo}'
+    if opcode == 7:
+        return f'c = a >> {combo}'
+    raise ValueError(f"Neplatný opcode: {opcode}")
+
+@lru_cache(maxsize=None)
+def _compile(program):
+    length = len(program)
+    # Začátky bloků: start, cíle skoků a instrukce za každým skokem
+    leaders = {0}
+    for ip in range(0, length - 1, 2):
+        if program[ip] == 3:
+            leaders.add(program[ip + 1])
+            leaders.add(ip + 2)
+    leaders = sorted(ip for ip in leaders if ip < length - 1)
+    
+    lines = ['def run(a, b, c):',
+             '    out = []',
+             '    append = out.append',
+             '    ip = 0',
+             '    while True:']
+    for index, leader in enumerate(leaders):
+        lines.append(f'        {"if" if index == 0 else "elif"} ip == {leader}:')
+        body = []
+        ip = leader
+        jump = None
+        while True:
+            opcode, operand = program[ip], program[ip + 1]
+            ip += 2
+            if opcode == 3:
+                jump = operand
+                break
+            body.append(_instruction_source(opcode, operand))
+            if ip >= length - 1 or ip in leaders:
+                break
+        
+        if jump == leader:
+            # Blok skáče sám na sebe (typicky smyčka končící 3,0):
+            # běží jako nativní smyčka bez návratu do větvení podle ip
+            lines.append('            while True:')
+            lines.extend(f'                {line}' for line in body)
+            lines.append('                if not a:')
+            lines.append('                    break')
+        else:
+            lines.extend(f'            {line}' for line in body)
+            if jump is not None:
+                lines.append('            if a:')
+                lines.append(f'                ip = {jump}')
+                lines.append('                continue')
+        lines.append(f'            ip = {ip}')
+    if leaders:
+        lines.append('        else:')
+        lines.append('            return out, a, b, c, ip')
+    else:
+        # Prázdný program nemá žádný blok a hned skončí
+        lines.append('        return out, a, b, c, ip')
+    
+    namespace = {}
+    exec('\n'.join(lines), namespace)
+    return namespace['run']
+
+def compile_program(program):
+    """
+    Přeloží program na specializovanou funkci run(a, b, c), která vrátí
+    (seznam výstupních čísel, a, b, c, ip) po doběhnutí programu.
+    
+    Registry jsou lokální proměnné, každý blok instrukcí mezi skoky je
+    jedna větev podle ip a dělení mocninou dvou je posun. Blok, který
+    skáče sám na sebe, se přeloží na nativní smyčku while. Přeložené
+    funkce se pamatují podle programu.
+    """
+    if isinstance(program, str):
+        return _compile_text(program)
+    return _compile(tuple(program))
+
+@lru_cache(maxsize=None)
+def _compile_text(program):
+    # Textový program se neparsuje znovu při každém spuštění
+    return _compile(tuple(int(x.strip()) for x in program.split(',')))
+
+def _shift_right(value, shift):
+    """Posun uint64 doprava, který pro posun o 64 a víc bitů vrátí 0."""
+    return np.where(shift < 64, value >> np.minimum(shift, np.uint64(63)), np.uint64(0))
+
+def run_program_batch(program, register_a, register_b=0, register_c=0, max_outputs=32):
+    """
+    Spustí stejný program pro celé pole hodnot registru A najednou.
+    
+    Každá hodnota je jeden pruh uint64. Pruhy běží v lockstepu: v každém
+    kroku se instrukce provede pro všechny pruhy se stejným ip (obvykle
+    všechny), doběhnuté pruhy se z polí vyřadí. Vrací (výstupy, počty),
+    kde výstupy mají tvar (n, max_outputs) doplněný -1 a počty udávají
+    počet vypsaných čísel. Pruh, který chce vypsat víc než max_outputs
+    čísel, se zastaví s počtem max_outputs + 1.
+    """
+    if isinstance(program, str):
+        program = [int(x.strip()) for x in program.split(',')]
+    length = len(program)
+    
+    register_a = np.asarray(register_a, dtype=np.uint64).ravel()
+    lanes = register_a.size
+    a = register_a.copy()
+    b = np.broadcast_to(np.asarray(register_b, dtype=np.uint64), lanes).copy()
+    c = np.broadcast_to(np.asarray(register_c, dtype=np.uint64), lanes).copy()
+    ip = np.zeros(lanes, dtype=np.int64)
+    index = np.arange(lanes)
+    
+    outputs = np.full((lanes, max_outputs), -1, dtype=np.int8)
+    counts = np.zeros(lanes, dtype=np.int64)
+    seven = np.uint64(7)
+    
+    while index.size:
+        if (ip == ip[0]).all():
+            groups = [(int(ip[0]), slice(None))]
+        else:
+            groups = [(int(position), ip == position) for position in np.unique(ip)]
+        
+        for position, sel in groups:
+            opcode, operand = program[position], program[position + 1]
+            literal = np.uint64(operand)
+            if opcode in (0, 2, 5, 6, 7):
+                if operand <= 3:
+                    combo = literal
+                elif operand == 4:
+                    combo = a[sel]
+                elif operand == 5:
+                    combo = b[sel]
+                elif operand == 6:
+                    combo = c[sel]
+                else:
+                    raise ValueError("Neplatný combo operand")
+            
+            if opcode == 0:
+                a[sel] = _shift_right(a[sel], combo)
+            elif opcode == 1:
+                b[sel] ^= literal
+            elif opcode == 2:
+                b[sel] = combo & seven
+            elif opcode == 3:
+                ip[sel] = np.where(a[sel] != 0, operand - 2, ip[sel])
+            elif opcode == 4:
+                b[sel] ^= c[sel]
+            elif opcode == 5:
+                rows = index[sel]
+                column = counts[rows]
+                fits = column < max_outputs
+                values = np.broadcast_to(combo & seven, rows.shape)
+                outputs[rows[fits], column[fits]] = values[fits]
+                counts[rows] += 1
+                # Přeplněný pruh se zastaví posunem ip za konec programu
+                ip[sel] = np.where(fits, ip[sel], length)
+            elif opcode == 6:
+                b[sel] = _shift_right(a[sel], combo)
+            elif opcode == 7:
+                c[sel] = _shift_right(a[sel], combo)
+            ip[sel] += 2
+        
+        running = ip < length - 1
+        if not running.all():
+            index, a, b, c, ip = index[running], a[running], b[running], c[running], ip[running]
+    
+    return outputs, counts
+
+def match_outputs(program, register_a, target):
+    """
+    Pro pole hodnot A vrátí masku pruhů, jejichž výstup je přesně target
+    (seznam čísel nebo řetězec "a,b,c")
+    """
+    if isinstance(target, str):
+        target = [int(x.strip()) for x in target.split(',')]
+    outputs, counts = run_program_batch(program, register_a, max_outputs=len(target))
+    return (counts == len(target)) & (outputs == np.asarray(target, dtype=np.int8)).all(axis=1)
+
+def _symbolic_shift(value, amount, width):
+    """
+    Posun symbolické hodnoty doprava. Hodnota je (známé číslo nebo None,
+    n-tice množin bitů A, na kterých závisí jednotlivé bity). Při neznámém
+    posunu může bit j pocházet z kteréhokoli bitu j + x pro možné x.
+    """
+    known, bits = value
+    amount_known, amount_bits = amount
+    if amount_known is not None:
+        shifted = bits[amount_known:] + (frozenset(),) * min(amount_known, width)
+        return (known >> amount_known if known is not None else None), shifted[:width]
+    
+    # Posun může být nejvýše 2^(počet neprázdných bitů) - 1
+    highest = max((i + 1 for i, deps in enumerate(amount_bits) if deps), default=0)
+    max_amount = min((1 << highest) - 1, width)
+    amount_deps = frozenset().union(*amount_bits)
+    shifted = tuple(frozenset().union(*bits[j:j + max_amount + 1]) | amount_deps
+                    for j in range(width))
+    return None, shifted
+
+def output_bit_windows(program, num_outputs=None, a_bits=None, register_b=0, register_c=0):
+    """
+    Symbolicky projde program a pro každé vypsané číslo vrátí okno bitů
+    registru A (od, do), ze kterého může číslo záviset (do je exkluzivní).
+    
+    Registry se sledují po bitech jako množiny indexů bitů A. Skok jnz se
+    bere, dokud nevznikne num_outputs čísel (výchozí je délka programu),
+    A má a_bits bitů (výchozí 3 * num_outputs). Posun A musí být konstantní.
+    Číslo mimo okno nezávisí na bitech A mimo něj, takže hledání může
+    kandidáty lišící se jen jinde přeskočit.
+    """
+    if isinstance(program, str):
+        program = [int(x.strip()) for x in program.split(',')]
+    num_outputs = len(program) if num_outputs is None else num_outputs
+    width = 3 * num_outputs if a_bits is None else a_bits
+    empty = (frozenset(),) * width
+    
+    def constant(value):
+        return value, empty
+    
+    def low_three(value):
+        known, bits = value
+        return (known & 7 if known is not None else None), bits[:3] + empty[3:]
+    
+    def xor(first, second):
+        known = first[0] ^ second[0] if first[0] is not None and second[0] is not None else None
+        return known, tuple(x | y for x, y in zip(first[1], second[1]))
+    
+    a_shift = 0
+    registers = {'B': constant(register_b), 'C': constant(register_c)}
+    windows = []
+    ip = 0
+    
+    while ip < len(program) - 1 and len(windows) < num_outputs:
+        opcode, operand = program[ip], program[ip + 1]
+        register_a = (None, tuple(frozenset([a_shift + j]) if a_shift + j < width else frozenset()
+                                  for j in range(width)))
+        combo = {4: register_a, 5: registers['B'], 6: registers['C']}.get(operand)
+        if combo is None and operand <= 3:
+            combo = constant(operand)
+        
+        if opcode == 0:
+            if combo[0] is None:
+                raise ValueError("Symbolický průchod vyžaduje konstantní posun registru A")
+            a_shift += combo[0]
+        elif opcode == 1:
+            registers['B'] = xor(registers['B'], constant(operand))
+        elif opcode == 2:
+            registers['B'] = low_three(combo)
+        elif opcode == 3:
+            if len(windows) < num_outputs:
+                ip = operand
+                continue
+        elif opcode == 4:
+            registers['B'] = xor(registers['B'], registers['C'])
+        elif opcode == 5:
+            deps = frozenset().union(*low_three(combo)[1])
+            windows.append((min(deps), max(deps) + 1) if deps else (0, 0))
+        elif opcode == 6:
+            registers['B'] = _symbolic_shift(register_a, combo, width)
+        elif opcode == 7:
+            registers['C'] = _symbolic_shift(register_a, combo, width)
+        ip += 2
+    
+    return windows
+
 if __name__ == "__main__":
     computer = ThreeBitComputer(
         register_a=0000000,
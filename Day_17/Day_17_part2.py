@@ -1,3 +1,7 @@
+import numpy as np
+
+from Day_17 import match_outputs
+
 class ThreeBitComputer:
     def __init__(self, register_a=0, register_b=0, register_c=0):
         self.reset_registers(register_a, register_b, register_c)
@@ -75,27 +79,81 @@ class ThreeBitComputer:
         
         return ','.join(self.outputs)
 
-def find_solution(program, start_value=630000000, max_attempts=1000000000):
+def has_shift_by_three_loop(program):
+    """
+    Ověří, že program je jedna smyčka, která v každém průchodu jednou
+    posune A o 3 bity doprava (0,3) a na konci skočí na začátek (3,0).
+    """
+    pairs = list(zip(program[::2], program[1::2]))
+    opcodes = [opcode for opcode, _ in pairs]
+    return (pairs[-1] == (3, 0) and (0, 3) in pairs
+            and opcodes.count(0) == 1 and opcodes.count(3) == 1)
+
+def find_solution(program):
     """
     Hledá nejmenší kladné číslo pro registr A, které způsobí,
-    že program vypíše sám sebe
+    že program vypíše sám sebe.
+    
+    Každý průchod smyčkou zahodí spodní 3 bity A, takže poslední výstupní
+    číslice závisí jen na nejvyšší osmičkové číslici A. A se proto skládá
+    po 3 bitech od poslední číslice programu: ke každému prefixu se zkusí
+    číslice 0-7 a ponechají se ty, jejichž výstup je přesně odpovídající
+    konec programu. Prohledávání do hloubky se vzestupnými číslicemi najde
+    nejmenší řešení jako první.
     """
+    digits = [int(x.strip()) for x in program.split(',')]
+    if not has_shift_by_three_loop(digits):
+        print("Program nemá tvar smyčky s posunem A o 3 bity, zkouším hrubou silou")
+        return find_solution_brute_force(program)
+    
     computer = ThreeBitComputer()
+    print(f"Hledám řešení pro program: {program}")
+    
+    runs = 0
+    # Zásobník (prefix A, počet už odpovídajících číslic od konce)
+    stack = [(0, 0)]
+    while stack:
+        prefix, matched = stack.pop()
+        if matched == len(digits):
+            if prefix > 0:
+                print(f"Nalezeno řešení! A = {prefix} (spuštění programu: {runs})")
+                return prefix
+            continue
+        
+        expected = ','.join(map(str, digits[len(digits) - matched - 1:]))
+        # Na zásobník v opačném pořadí, aby se menší číslice zkoušely dřív
+        for digit in range(7, -1, -1):
+            candidate = prefix * 8 + digit
+            if candidate == 0:
+                continue
+            computer.reset_registers(register_a=candidate)
+            runs += 1
+            if computer.run_program(digits) == expected:
+                stack.append((candidate, matched + 1))
+    
+    print("Řešení neexistuje")
+    return None
+
+def find_solution_brute_force(program, start_value=630000000, max_attempts=1000000000, batch_size=100000):
+    """
+    Hledá nejmenší kladné číslo pro registr A, které způsobí,
+    že program vypíše sám sebe (postupným zkoušením hodnot A).
+    Hodnoty se zkoušejí po dávkách přes vektorizovaný run_program_batch.
+    """
     target_output = program  
+    end_value = start_value + max_attempts
     
     print(f"Hledám řešení pro program: {program}")
     print(f"Cílový výstup: {target_output}")
     
-    for a in range(start_value, start_value + max_attempts):
-        if a % 10000 == 0:  
-            print(f"Zkouším hodnotu A: {a}")
-            
-        computer.reset_registers(register_a=a)
-        output = computer.run_program(program)
+    for batch_start in range(start_value, end_value, batch_size):
+        print(f"Zkouším hodnoty A od: {batch_start}")
+        values = np.arange(batch_start, min(batch_start + batch_size, end_value), dtype=np.uint64)
+        matches = np.flatnonzero(match_outputs(program, values, target_output))
         
-        if output == target_output:
+        if matches.size:
+            a = int(values[matches[0]])
             print(f"Nalezeno řešení! A = {a}")
-            print(f"Výstup: {output}")
             print(f"Očekáváno: {target_output}")
             return a
             